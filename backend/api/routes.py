@@ -1,25 +1,146 @@
-from flask import Blueprint, jsonify, send_file
-import json
+from flask import Blueprint, Response, send_file, request
 import os
+import threading
+from collections import OrderedDict
+from statistical_analysis.rollup_cube import RollupCube
+from statistical_analysis.scenarios import ScenarioEngine
+from statistical_analysis.downsampling import downsample_records, resolve_max_points, min_points, DOWNSAMPLING_METHODS
+from storage.history_store import HistoryStore, HISTORY_DATASETS
+from storage.compact_frames import memory_report
+from storage.shared_artifacts import SharedArtifactStore
+from utils.serialization import json_response, load_file, loads, dumps, JSON_MIMETYPE
 
 api_bp = Blueprint('api', __name__)
 
 RAW_DATA_DIR = os.path.join(os.path.dirname(__file__), '../../data/raw')
 PROCESSED_DATA_DIR = os.path.join(os.path.dirname(__file__), '../../data/processed')
 
+# Built on first use, so importing the blueprint creates no files and tests
+# can assign instances rooted in a temporary directory instead
+history_store = None
+shared_store = None
+scenario_engine = None
+_components_lock = threading.Lock()
+
+def get_history_store():
+    """The archive of data generations, created on first use"""
+    global history_store
+    with _components_lock:
+        if history_store is None:
+            history_store = HistoryStore()
+        return history_store
+
+def get_shared_store():
+    """The shared artifact store, created on first use"""
+    global shared_store
+    with _components_lock:
+        if shared_store is None:
+            shared_store = SharedArtifactStore()
+        return shared_store
+
+def get_scenario_engine():
+    """The Monte Carlo scenario engine, created on first use"""
+    global scenario_engine
+    with _components_lock:
+        if scenario_engine is None:
+            scenario_engine = ScenarioEngine(RAW_DATA_DIR, f"{PROCESSED_DATA_DIR}/scenarios")
+        return scenario_engine
+
 def load_json(filepath):
     """Helper to load JSON files safely"""
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        return load_file(filepath)
     except FileNotFoundError:
         return {"error": "Data not available yet. Please run data collection first."}
     except Exception as e:
         return {"error": str(e)}
 
-@api_bp.route('/market/overview', methods=['GET'])
-def get_market_overview():
-    """Get comprehensive market overview"""
+def serve_artifact(name, builder):
+    """Serve a response from the shared artifact store, building it if not yet published"""
+    generation = get_shared_store().current()
+    body = generation.response(name) if generation else None
+    if body is None:
+        return json_response(builder())
+    # WSGI servers such as gunicorn only write bytes; copying out of the shared
+    # page cache is a single memcpy of the pre-encoded body
+    response = Response(bytes(body), mimetype=JSON_MIMETYPE)
+    # The generation identifies the bytes, so clients can revalidate without hashing the body
+    response.set_etag(f"{generation.name}:{name}")
+    response.headers['X-Data-Generation'] = generation.name
+    return response
+
+# Time-series responses that accept max_points/resolution:
+# (records key in the payload or None for a bare list, x column, value columns, series column)
+DOWNSAMPLED_SERIES = {
+    'market_overview': ('market_data', 'year',
+                        ['market_size_billions', 'segment_residential', 'segment_commercial', 'segment_industrial'], None),
+    'market_size': (None, 'year',
+                    ['market_size_billions', 'segment_residential', 'segment_commercial', 'segment_industrial'], None),
+    'services': ('service_data', 'date', ['demand_score', 'volume', 'avg_ticket_value'], 'service_type')
+}
+
+DOWNSAMPLE_CACHE_SIZE = 64
+_downsample_cache = OrderedDict()
+_downsample_lock = threading.Lock()
+
+def downsample_payload(name, payload, max_points, method):
+    """Copy of a payload with its time series reduced to max_points per series"""
+    key, x, y, group = DOWNSAMPLED_SERIES[name]
+    records = payload if key is None else payload.get(key)
+    if not isinstance(records, list):
+        return payload
+    sampled = downsample_records(records, x, y, max_points, method=method, group=group)
+    if key is None:
+        return sampled
+    return {**payload, key: sampled,
+            "downsampling": {"method": method, "max_points": max_points,
+                             "points": len(sampled), "source_points": len(records)}}
+
+def serve_series(name, builder):
+    """Serve a time-series artifact, downsampled when ``max_points`` or ``resolution`` is given
+
+    ``method`` selects ``lttb`` (default) or ``minmax`` bucketing. Encoded
+    results are cached per data generation, method and point budget.
+    """
+    method = request.args.get('method', 'lttb')
+    try:
+        max_points = resolve_max_points(request.args.get('max_points'), request.args.get('resolution'))
+        if method not in DOWNSAMPLING_METHODS:
+            raise ValueError(f"method must be one of {', '.join(DOWNSAMPLING_METHODS)}")
+        n_cols = len(DOWNSAMPLED_SERIES[name][2])
+        if max_points is not None and max_points < min_points(method, n_cols):
+            raise ValueError(f"max_points must be at least {min_points(method, n_cols)} "
+                             f"for {method} over {n_cols} value columns")
+    except ValueError as e:
+        return json_response({"error": str(e), "status": "error"}, status=400)
+    if max_points is None:
+        return serve_artifact(name, builder)
+
+    generation = get_shared_store().current()
+    cache_key = (generation.name if generation else None, name, method, max_points)
+    with _downsample_lock:
+        body = _downsample_cache.get(cache_key) if generation else None
+        if body is not None:
+            _downsample_cache.move_to_end(cache_key)
+
+    if body is None:
+        published = generation.response(name) if generation else None
+        payload = loads(published) if published is not None else builder()
+        body = dumps(downsample_payload(name, payload, max_points, method))
+        if generation:
+            with _downsample_lock:
+                _downsample_cache[cache_key] = body
+                while len(_downsample_cache) > DOWNSAMPLE_CACHE_SIZE:
+                    _downsample_cache.popitem(last=False)
+
+    response = Response(body, mimetype=JSON_MIMETYPE)
+    if generation:
+        response.set_etag(f"{generation.name}:{name}:{method}:{max_points}")
+        response.headers['X-Data-Generation'] = generation.name
+    return response
+
+def build_market_overview():
+    """Build the comprehensive market overview payload"""
     market_size = load_json(f"{RAW_DATA_DIR}/market_size.json")
     growth_analysis = load_json(f"{PROCESSED_DATA_DIR}/growth_analysis.json")
 
@@ -29,17 +150,25 @@ def get_market_overview():
         "status": "success"
     }
 
-    return jsonify(overview)
+    return overview
+
+@api_bp.route('/market/overview', methods=['GET'])
+def get_market_overview():
+    """Get comprehensive market overview; accepts max_points/resolution/method"""
+    return serve_series('market_overview', build_market_overview)
+
+def build_market_size():
+    """Build the market size data payload"""
+    data = load_json(f"{RAW_DATA_DIR}/market_size.json")
+    return data
 
 @api_bp.route('/market/size', methods=['GET'])
 def get_market_size():
-    """Get market size data"""
-    data = load_json(f"{RAW_DATA_DIR}/market_size.json")
-    return jsonify(data)
+    """Get market size data; accepts max_points/resolution/method"""
+    return serve_series('market_size', build_market_size)
 
-@api_bp.route('/pricing', methods=['GET'])
-def get_pricing():
-    """Get pricing data and analysis"""
+def build_pricing():
+    """Build the pricing data and analysis payload"""
     pricing_data = load_json(f"{RAW_DATA_DIR}/pricing.json")
     pricing_analysis = load_json(f"{PROCESSED_DATA_DIR}/pricing_analysis.json")
 
@@ -49,11 +178,15 @@ def get_pricing():
         "status": "success"
     }
 
-    return jsonify(response)
+    return response
 
-@api_bp.route('/competitors', methods=['GET'])
-def get_competitors():
-    """Get competitor data and analysis"""
+@api_bp.route('/pricing', methods=['GET'])
+def get_pricing():
+    """Get pricing data and analysis"""
+    return serve_artifact('pricing', build_pricing)
+
+def build_competitors():
+    """Build the competitor data and analysis payload"""
     competitor_data = load_json(f"{RAW_DATA_DIR}/competitors.json")
     competitive_analysis = load_json(f"{PROCESSED_DATA_DIR}/competitive_analysis.json")
 
@@ -63,11 +196,25 @@ def get_competitors():
         "status": "success"
     }
 
-    return jsonify(response)
+    return response
 
-@api_bp.route('/regional', methods=['GET'])
-def get_regional():
-    """Get regional market data"""
+@api_bp.route('/competitors', methods=['GET'])
+def get_competitors():
+    """Get competitor data and analysis"""
+    return serve_artifact('competitors', build_competitors)
+
+def build_competitor_concentration():
+    """Build the competitor concentration time-series payload"""
+    concentration = load_json(f"{PROCESSED_DATA_DIR}/competitive_concentration.json")
+    return {**concentration, "status": "success"} if "error" not in concentration else concentration
+
+@api_bp.route('/competitors/concentration', methods=['GET'])
+def get_competitor_concentration():
+    """HHI, CR4 and leaders per archived data generation, plus trailing-window averages"""
+    return serve_artifact('competitor_concentration', build_competitor_concentration)
+
+def build_regional():
+    """Build the regional market data payload"""
     regional_data = load_json(f"{RAW_DATA_DIR}/regional.json")
     regional_analysis = load_json(f"{PROCESSED_DATA_DIR}/regional_analysis.json")
 
@@ -77,11 +224,15 @@ def get_regional():
         "status": "success"
     }
 
-    return jsonify(response)
+    return response
 
-@api_bp.route('/services', methods=['GET'])
-def get_services():
-    """Get service demand data"""
+@api_bp.route('/regional', methods=['GET'])
+def get_regional():
+    """Get regional market data"""
+    return serve_artifact('regional', build_regional)
+
+def build_services():
+    """Build the service demand data payload"""
     service_data = load_json(f"{RAW_DATA_DIR}/service_demand.json")
     demand_forecasts = load_json(f"{PROCESSED_DATA_DIR}/demand_forecasts.json")
 
@@ -91,11 +242,51 @@ def get_services():
         "status": "success"
     }
 
-    return jsonify(response)
+    return response
 
-@api_bp.route('/trends', methods=['GET'])
-def get_trends():
-    """Get industry trends"""
+@api_bp.route('/services', methods=['GET'])
+def get_services():
+    """Get service demand data; accepts max_points/resolution/method"""
+    return serve_series('services', build_services)
+
+_cube_cache = {'mtime': None, 'cube': None}
+
+def load_service_cube():
+    """Load the service demand rollup cube, reusing it until the file changes"""
+    filepath = f"{PROCESSED_DATA_DIR}/service_demand_cube.json"
+    mtime = os.path.getmtime(filepath)
+    if _cube_cache['mtime'] != mtime:
+        _cube_cache['cube'] = RollupCube.load(filepath)
+        _cube_cache['mtime'] = mtime
+    return _cube_cache['cube']
+
+@api_bp.route('/services/rollup', methods=['GET'])
+def get_services_rollup():
+    """Query the pre-aggregated service demand cube
+
+    Query parameters: ``by`` (comma-separated dimensions), ``measures``,
+    ``stats`` and any dimension as a filter, e.g.
+    ``/api/services/rollup?by=quarter&service_type=Inspections&stats=mean``.
+    """
+    try:
+        cube = load_service_cube()
+    except FileNotFoundError:
+        return json_response({"error": "Data not available yet. Please run data collection first."}, status=404)
+
+    def split(param):
+        value = request.args.get(param)
+        return [v for v in value.split(',') if v] if value else None
+
+    filters = {k: v for k, v in request.args.items() if k not in ('by', 'measures', 'stats')}
+    try:
+        rows = cube.query(by=split('by') or [], measures=split('measures'), stats=split('stats'), **filters)
+    except ValueError as e:
+        return json_response({"error": str(e), "status": "error"}, status=400)
+
+    return json_response({"rows": rows, "status": "success"})
+
+def build_trends():
+    """Build the industry trends payload"""
     trends_data = load_json(f"{RAW_DATA_DIR}/industry_trends.json")
     trend_significance = load_json(f"{PROCESSED_DATA_DIR}/trend_significance.json")
 
@@ -105,52 +296,150 @@ def get_trends():
         "status": "success"
     }
 
-    return jsonify(response)
+    return response
+
+@api_bp.route('/trends', methods=['GET'])
+def get_trends():
+    """Get industry trends"""
+    return serve_artifact('trends', build_trends)
+
+def build_forecasts():
+    """Build the market forecasts payload"""
+    forecasts = load_json(f"{PROCESSED_DATA_DIR}/forecasts.json")
+
+    return forecasts
+
+@api_bp.route('/scenarios', methods=['GET', 'POST'])
+def get_scenarios():
+    """Monte Carlo market-size percentile bands by segment and region
+
+    Parameters (query string or JSON body): horizon_years, n_paths,
+    growth_mean, growth_vol, idiosyncratic_vol, shock_probability,
+    shock_mean, shock_vol and seed. Results are cached by parameter hash.
+    """
+    overrides = dict(request.args)
+    if request.method == 'POST':
+        overrides.update(request.get_json(silent=True) or {})
+
+    try:
+        result = get_scenario_engine().simulate(overrides)
+    except FileNotFoundError:
+        return json_response({"error": "Data not available yet. Please run data collection first."}, status=404)
+    except ValueError as e:
+        return json_response({"error": str(e), "status": "error"}, status=400)
+
+    return json_response({**result, "status": "success"})
 
 @api_bp.route('/forecasts', methods=['GET'])
 def get_forecasts():
     """Get market forecasts"""
+    return serve_artifact('forecasts', build_forecasts)
+
+def build_dashboard_summary():
+    """Build the dashboard summary payload"""
+    # Load all key metrics
+    market_size = load_json(f"{RAW_DATA_DIR}/market_size.json")
+    growth_analysis = load_json(f"{PROCESSED_DATA_DIR}/growth_analysis.json")
+    competitive_analysis = load_json(f"{PROCESSED_DATA_DIR}/competitive_analysis.json")
+    regional_analysis = load_json(f"{PROCESSED_DATA_DIR}/regional_analysis.json")
     forecasts = load_json(f"{PROCESSED_DATA_DIR}/forecasts.json")
 
-    return jsonify(forecasts)
+    # Get current market size
+    current_market = market_size[-1] if isinstance(market_size, list) else {}
+
+    summary = {
+        "key_metrics": {
+            "current_market_size_billions": current_market.get('market_size_billions', 0),
+            "cagr_percent": growth_analysis.get('cagr_percent', 0),
+            "market_concentration_hhi": competitive_analysis.get('market_structure', {}).get('hhi_index', 0),
+            "total_global_market": regional_analysis.get('total_market_size', 0),
+            "weighted_growth_rate": regional_analysis.get('weighted_avg_growth', 0)
+        },
+        "forecasts": forecasts,
+        "market_structure": competitive_analysis.get('market_structure', {}),
+        "top_competitors": competitive_analysis.get('leaders', [])[:5],
+        "regional_insights": regional_analysis.get('insights', {}),
+        "status": "success"
+    }
+
+    return summary
 
 @api_bp.route('/dashboard/summary', methods=['GET'])
 def get_dashboard_summary():
     """Get comprehensive dashboard summary"""
     try:
-        # Load all key metrics
-        market_size = load_json(f"{RAW_DATA_DIR}/market_size.json")
-        growth_analysis = load_json(f"{PROCESSED_DATA_DIR}/growth_analysis.json")
-        competitive_analysis = load_json(f"{PROCESSED_DATA_DIR}/competitive_analysis.json")
-        regional_analysis = load_json(f"{PROCESSED_DATA_DIR}/regional_analysis.json")
-        forecasts = load_json(f"{PROCESSED_DATA_DIR}/forecasts.json")
-
-        # Get current market size
-        current_market = market_size[-1] if isinstance(market_size, list) else {}
-
-        summary = {
-            "key_metrics": {
-                "current_market_size_billions": current_market.get('market_size_billions', 0),
-                "cagr_percent": growth_analysis.get('cagr_percent', 0),
-                "market_concentration_hhi": competitive_analysis.get('market_structure', {}).get('hhi_index', 0),
-                "total_global_market": regional_analysis.get('total_market_size', 0),
-                "weighted_growth_rate": regional_analysis.get('weighted_avg_growth', 0)
-            },
-            "forecasts": forecasts,
-            "market_structure": competitive_analysis.get('market_structure', {}),
-            "top_competitors": competitive_analysis.get('leaders', [])[:5],
-            "regional_insights": regional_analysis.get('insights', {}),
-            "status": "success"
-        }
-
-        return jsonify(summary)
+        return serve_artifact('dashboard_summary', build_dashboard_summary)
     except Exception as e:
-        return jsonify({"error": str(e), "status": "error"}), 500
+        return json_response({"error": str(e), "status": "error"}, status=500)
+
+# Responses that depend only on the published data files, pre-serialized once per generation
+ARTIFACT_BUILDERS = {
+    'market_overview': build_market_overview,
+    'market_size': build_market_size,
+    'pricing': build_pricing,
+    'competitors': build_competitors,
+    'competitor_concentration': build_competitor_concentration,
+    'regional': build_regional,
+    'services': build_services,
+    'trends': build_trends,
+    'forecasts': build_forecasts,
+    'dashboard_summary': build_dashboard_summary
+}
+
+def publish_shared_artifacts():
+    """Pre-serialize every artifact response into a new shared generation"""
+    responses = {name: dumps(builder()) for name, builder in ARTIFACT_BUILDERS.items()}
+    return get_shared_store().publish(responses)
+
+@api_bp.route('/history/generations', methods=['GET'])
+def get_history_generations():
+    """List archived data generations, newest first"""
+    limit = request.args.get('limit')
+    if limit is not None and not (limit.isdigit() and int(limit) > 0):
+        return json_response({"error": "limit must be a positive integer", "status": "error"}, status=400)
+
+    generations = get_history_store().generations(limit=limit)
+    return json_response({"generations": generations, "status": "success"})
+
+@api_bp.route('/history/<dataset>', methods=['GET'])
+def get_history_dataset(dataset):
+    """Read a dataset as it stood at ``as_of`` (generation id or ISO timestamp)"""
+    if dataset not in HISTORY_DATASETS:
+        return json_response({"error": f"Unknown dataset: {dataset}", "status": "error"}, status=404)
+
+    try:
+        generation, data = get_history_store().read(dataset, as_of=request.args.get('as_of'))
+    except ValueError as e:
+        return json_response({"error": str(e), "status": "error"}, status=400)
+
+    if generation is None:
+        return json_response({"error": "No archived generation matches the request.", "status": "error"}, status=404)
+
+    return json_response({"dataset": dataset, "generation": generation, "data": data, "status": "success"})
+
+@api_bp.route('/history/<dataset>/diff', methods=['GET'])
+def get_history_diff(dataset):
+    """Records added, removed and changed between two generations (``from`` and ``to``)"""
+    if dataset not in HISTORY_DATASETS:
+        return json_response({"error": f"Unknown dataset: {dataset}", "status": "error"}, status=404)
+
+    try:
+        diff = get_history_store().diff(dataset, request.args.get('from'), request.args.get('to'))
+    except ValueError as e:
+        return json_response({"error": str(e), "status": "error"}, status=400)
+
+    diff["status"] = "success"
+    return json_response(diff)
+
+@api_bp.route('/memory', methods=['GET'])
+def get_memory_report():
+    """Bytes per dataset as plain frames versus compact typed frames, for sizing workers"""
+    return json_response({"datasets": memory_report(RAW_DATA_DIR), "status": "success"})
 
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return json_response({
         "status": "healthy",
         "service": "Market Analysis API",
         "version": "1.0.0"
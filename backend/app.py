@@ -1,14 +1,16 @@
-from flask import Flask, jsonify, request
+from flask import Flask, request
+import math
 from flask_cors import CORS
 from datetime import datetime
 import os
-from api.routes import api_bp
+from api.routes import api_bp, get_history_store, publish_shared_artifacts, RAW_DATA_DIR, PROCESSED_DATA_DIR
 from data_collection.market_scraper import MarketDataCollector
 from statistical_analysis.analyzer import StatisticalAnalyzer
-from apscheduler.schedulers.background import BackgroundScheduler
+from data_collection.refresh_scheduler import RefreshScheduler, RefreshJob
+from utils.serialization import json_response
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['ETag', 'X-Data-Generation'])
 
 # Initialize components
 data_collector = MarketDataCollector()
@@ -17,25 +19,78 @@ analyzer = StatisticalAnalyzer()
 # Register blueprints
 app.register_blueprint(api_bp, url_prefix='/api')
 
-# Background scheduler for periodic data updates
-scheduler = BackgroundScheduler()
+@app.after_request
+def add_conditional_caching(response):
+    """Tag JSON GET responses with an ETag and answer matching If-None-Match with 304"""
+    if request.method != 'GET' or response.status_code != 200 or response.mimetype != 'application/json':
+        return response
+    if response.get_etag()[0] is None:
+        response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+# Lock files that elect one scheduler process and serialize refreshes across workers
+LOCK_DIR = os.path.join(os.path.dirname(__file__), '../data/locks')
+
+# Archived generations covered by the competitor concentration time series, and its rolling window
+CONCENTRATION_GENERATIONS = 52
+CONCENTRATION_WINDOW = 4
+
+def update_competitor_concentration():
+    """Concentration per archived generation of the competitor list; cached generations are reused"""
+    store = get_history_store()
+    records = []
+    for entry in store.generations(limit=CONCENTRATION_GENERATIONS):
+        generation, competitors = store.read('competitors', as_of=entry['generation'])
+        records += [{**row, 'market': 'Global', 'period': generation} for row in competitors]
+    analyzer.competitive_concentration_timeseries(records, window=CONCENTRATION_WINDOW)
+
+def publish_generation(_label=None):
+    """Archive the current files as a history generation and publish them to workers"""
+    get_history_store().record_generation(RAW_DATA_DIR, PROCESSED_DATA_DIR)
+    update_competitor_concentration()
+    publish_shared_artifacts()
+
+def refresh_all_datasets():
+    """Collect every dataset and rerun every analysis"""
+    data_collector.collect_all_data()
+    analyzer.refresh_analysis()
 
 def update_market_data():
-    """Periodic task to update market data"""
+    """Refresh every dataset and analysis at once, with no dataset job running alongside"""
     print(f"Updating market data at {datetime.now()}")
-    try:
-        data_collector.collect_all_data()
-        analyzer.refresh_analysis()
-    except Exception as e:
-        print(f"Error updating data: {e}")
+    return scheduler.run_exclusive('all datasets', refresh_all_datasets)
+
+# Background scheduler: each source refreshes on its own cadence and only
+# reruns the analyses that depend on it
+scheduler = RefreshScheduler(max_parallel_refreshes=2, on_complete=[publish_generation], lock_dir=LOCK_DIR)
+
+scheduler.register(RefreshJob(
+    'pricing', data_collector.generate_pricing_data, [analyzer.analyze_pricing_trends],
+    interval={'hours': 1}, priority=1, jitter_seconds=120, missed_run_policy='run_once'))
+scheduler.register(RefreshJob(
+    'service_demand', data_collector.generate_service_demand_data,
+    [analyzer.service_demand_forecasting, analyzer.build_service_demand_cube],
+    interval={'hours': 6}, priority=2, jitter_seconds=300, missed_run_policy='run_once'))
+scheduler.register(RefreshJob(
+    'market_size', data_collector.generate_market_size_data,
+    [analyzer.analyze_market_growth, analyzer.forecast_market_size],
+    interval={'days': 1}, priority=3, jitter_seconds=600, missed_run_policy='run_once'))
+scheduler.register(RefreshJob(
+    'regional', data_collector.generate_regional_data, [analyzer.regional_correlation_analysis],
+    interval={'days': 7}, priority=4, jitter_seconds=1800, missed_run_policy='run_once'))
+scheduler.register(RefreshJob(
+    'competitors', data_collector.generate_competitor_data, [analyzer.competitive_analysis],
+    interval={'weeks': 13}, priority=5, jitter_seconds=3600, missed_run_policy='run_once'))
+scheduler.register(RefreshJob(
+    'industry_trends', data_collector.generate_industry_trends, [analyzer.trend_significance_testing],
+    interval={'days': 30}, priority=6, jitter_seconds=3600, missed_run_policy='skip'))
 
-# Schedule data updates every 6 hours
-scheduler.add_job(func=update_market_data, trigger="interval", hours=6)
 scheduler.start()
 
 @app.route('/')
 def index():
-    return jsonify({
+    return json_response({
         "status": "active",
         "service": "Property Maintenance Market Analysis API",
         "version": "1.0.0",
@@ -45,27 +100,77 @@ def index():
             "competitors": "/api/competitors",
             "regional_data": "/api/regional",
             "services": "/api/services",
+            "services_rollup": "/api/services/rollup",
             "trends": "/api/trends",
-            "forecasts": "/api/forecasts"
+            "forecasts": "/api/forecasts",
+            "competitor_concentration": "/api/competitors/concentration",
+            "refresh_jobs": "/api/refresh/jobs",
+            "regional_observations": "/api/regional/observations [POST]",
+            "scenarios": "/api/scenarios",
+            "history": "/api/history/<dataset>?as_of=<generation|timestamp>",
+            "history_diff": "/api/history/<dataset>/diff?from=<generation>&to=<generation>"
         }
     })
 
 @app.route('/api/refresh', methods=['POST'])
 def refresh_data():
-    """Manually trigger data refresh"""
+    """Manually trigger a full refresh, or a single dataset with ?dataset=<job name>"""
+    dataset = request.args.get('dataset')
+    if dataset and dataset not in scheduler.jobs:
+        return json_response({"status": "error", "message": f"Unknown dataset: {dataset}"}, status=400)
+
     try:
-        update_market_data()
-        return jsonify({"status": "success", "message": "Data refresh initiated"})
+        if dataset:
+            if not scheduler.run_job(dataset):
+                return json_response({"status": "error", "message": scheduler.jobs[dataset].last_error}, status=500)
+        elif not update_market_data():
+            return json_response({"status": "error", "message": "Full refresh failed"}, status=500)
+        return json_response({"status": "success", "message": "Data refresh initiated"})
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return json_response({"status": "error", "message": str(e)}, status=500)
+
+@app.route('/api/regional/observations', methods=['POST'])
+def ingest_regional_observations():
+    """Fold streamed regional observations into the correlation matrix and republish
+
+    The body is a list of records (or ``{"observations": [...]}``) holding
+    every numeric regional column. The next scheduled regional refresh
+    replaces these with a fresh snapshot.
+    """
+    payload = request.get_json(silent=True)
+    observations = payload.get('observations') if isinstance(payload, dict) else payload
+    columns = analyzer.REGIONAL_NUMERIC_COLS
+
+    def is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+    if not (isinstance(observations, list) and observations and
+            all(isinstance(row, dict) and all(is_number(row.get(col)) for col in columns) for row in observations)):
+        return json_response({"status": "error",
+                              "message": f"Expected a non-empty list of records with numeric {', '.join(columns)}"},
+                             status=400)
+
+    result = {}
+
+    def ingest():
+        result.update(analyzer.ingest_regional_observations(observations))
+
+    if not scheduler.run_exclusive('regional observations', ingest) or not result:
+        return json_response({"status": "error", "message": "Ingesting regional observations failed"}, status=500)
+
+    return json_response({"correlation_matrix": result['correlation_matrix'],
+                          "correlation_observations": result['correlation_observations'],
+                          "status": "success"})
+
+@app.route('/api/refresh/jobs', methods=['GET'])
+def refresh_jobs():
+    """Per-dataset refresh schedule and last-run status"""
+    return json_response({"jobs": scheduler.status(), "schedule_running": scheduler.running, "status": "success"})
 
 if __name__ == '__main__':
     # Initial data collection
     print("Starting initial data collection...")
-    try:
-        data_collector.collect_all_data()
-        analyzer.refresh_analysis()
-    except Exception as e:
-        print(f"Initial data collection error: {e}")
+    if not update_market_data():
+        print("Initial data collection error")
 
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,255 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows runs a single development process
+    fcntl = None
+
+# How a job behaves when runs were missed (e.g. the process was down or busy)
+MISSED_RUN_POLICIES = {
+    'skip': {'coalesce': True, 'misfire_grace_time': 1},
+    'run_once': {'coalesce': True, 'misfire_grace_time': None},
+    'run_all': {'coalesce': False, 'misfire_grace_time': None}
+}
+
+
+class RefreshJob:
+    """One data source and the analyses that depend on it
+
+    ``interval`` holds APScheduler interval trigger arguments such as
+    ``{'hours': 1}``. Lower ``priority`` values win when jobs compete for
+    refresh slots.
+    """
+
+    def __init__(self, name, collect, analyses, interval, priority=5, jitter_seconds=0,
+                 max_concurrency=1, missed_run_policy='run_once'):
+        self.name = name
+        self.collect = collect
+        self.analyses = list(analyses)
+        self.interval = interval
+        self.priority = priority
+        self.jitter_seconds = jitter_seconds
+        self.max_concurrency = max_concurrency
+        self.missed_run_policy = missed_run_policy
+        self.last_run = None
+        self.last_duration_seconds = None
+        self.last_error = None
+        self.run_count = 0
+        # Shared by scheduled and manual runs of this job
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+
+class ProcessLock:
+    """Advisory lock file shared by every worker process
+
+    Each ``hold`` opens its own file descriptor, so threads of one process
+    exclude each other exactly like separate processes do. Without
+    ``fcntl`` (or without a path) the lock is a no-op.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._held = None
+
+    @contextmanager
+    def hold(self, shared=False):
+        """Block until the lock is held in shared or exclusive mode"""
+        if fcntl is None or self.path is None:
+            yield
+            return
+        with open(self.path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def try_acquire(self):
+        """Take the lock exclusively for the life of the process, without blocking"""
+        if fcntl is None or self.path is None:
+            return True
+        f = open(self.path, 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._held = f
+        return True
+
+
+class PriorityGate:
+    """Bounded number of concurrent refreshes, admitted in priority order
+
+    An exclusive holder takes every slot, e.g. a full refresh that rewrites
+    all datasets.
+    """
+
+    def __init__(self, slots):
+        self.slots = slots
+        self._active = 0
+        self._waiting = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, priority, exclusive=False):
+        """Block until enough slots are free and no higher-priority job is waiting"""
+        needed = self.slots if exclusive else 1
+        with self._condition:
+            ticket = (priority, next(self._counter))
+            heapq.heappush(self._waiting, ticket)
+            while self._active + needed > self.slots or self._waiting[0] != ticket:
+                self._condition.wait()
+            heapq.heappop(self._waiting)
+            self._active += needed
+            # The next waiter may fit in a remaining slot
+            self._condition.notify_all()
+
+    def release(self, exclusive=False):
+        """Free the slots and wake waiting jobs"""
+        with self._condition:
+            self._active -= self.slots if exclusive else 1
+            self._condition.notify_all()
+
+
+class RefreshScheduler:
+    """Schedules each dataset's collection and dependent analyses as its own job
+
+    Fast-moving sources (pricing) refresh often while slow ones (competitors,
+    industry trends) refresh rarely, so expensive recomputation only happens
+    where the data changed. ``on_complete`` callbacks run after every
+    successful run, e.g. to archive and publish the new generation.
+
+    With ``lock_dir``, lock files there coordinate every worker process:
+    only the process that wins ``scheduler.lock`` runs the schedule, dataset
+    jobs share ``refresh.lock`` while full refreshes take it exclusively,
+    and completion callbacks are serialized by ``publish.lock``.
+    """
+
+    def __init__(self, max_parallel_refreshes=2, on_complete=None, lock_dir=None):
+        self.jobs = {}
+        self.on_complete = list(on_complete or [])
+        self.running = False
+        self._gate = PriorityGate(max_parallel_refreshes)
+        self._publish_lock = threading.Lock()
+        self._scheduler = BackgroundScheduler()
+
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        path = (lambda name: os.path.join(lock_dir, name)) if lock_dir else (lambda name: None)
+        self._leader_lock = ProcessLock(path('scheduler.lock'))
+        self._refresh_file_lock = ProcessLock(path('refresh.lock'))
+        self._publish_file_lock = ProcessLock(path('publish.lock'))
+
+    def register(self, job):
+        """Add a job to the schedule"""
+        if job.missed_run_policy not in MISSED_RUN_POLICIES:
+            raise ValueError(f"Unknown missed-run policy: {job.missed_run_policy}")
+        self.jobs[job.name] = job
+        self._scheduler.add_job(
+            func=self.run_job,
+            args=[job.name],
+            trigger='interval',
+            id=job.name,
+            jitter=job.jitter_seconds or None,
+            max_instances=job.max_concurrency,
+            replace_existing=True,
+            **job.interval,
+            **MISSED_RUN_POLICIES[job.missed_run_policy]
+        )
+        return job
+
+    def start(self):
+        """Start the background scheduler if no other process already runs it"""
+        if not self._leader_lock.try_acquire():
+            print("Refresh schedule is run by another process")
+            return False
+        self._scheduler.start()
+        self.running = True
+        return True
+
+    def shutdown(self, wait=False):
+        """Stop the background scheduler"""
+        if self.running:
+            self._scheduler.shutdown(wait=wait)
+            self.running = False
+
+    def _execute(self, label, priority, work, exclusive=False):
+        """Run ``work`` in a refresh slot, then the completion callbacks"""
+        self._gate.acquire(priority, exclusive)
+        try:
+            with self._refresh_file_lock.hold(shared=not exclusive):
+                print(f"Refreshing {label} at {datetime.now()}")
+                work()
+                # Completion hooks read every artifact, so serialize them across jobs and workers
+                with self._publish_lock, self._publish_file_lock.hold():
+                    for callback in self.on_complete:
+                        callback(label)
+        finally:
+            self._gate.release(exclusive)
+
+    def run_job(self, name):
+        """Collect one dataset and rerun only the analyses that depend on it"""
+        job = self.jobs[name]
+
+        def work():
+            job.collect()
+            for analysis in job.analyses:
+                analysis()
+
+        started = time.monotonic()
+        with job._slots:
+            try:
+                self._execute(name, job.priority, work)
+                job.last_error = None
+                return True
+            except Exception as e:
+                job.last_error = str(e)
+                print(f"Error refreshing {name}: {e}")
+                return False
+            finally:
+                job.last_run = datetime.now().isoformat(timespec='seconds')
+                job.last_duration_seconds = time.monotonic() - started
+                job.run_count += 1
+
+    def run_exclusive(self, label, work, priority=0):
+        """Run ``work`` with every refresh slot held, e.g. a full refresh of all datasets"""
+        try:
+            self._execute(label, priority, work, exclusive=True)
+            return True
+        except Exception as e:
+            print(f"Error refreshing {label}: {e}")
+            return False
+
+    def status(self):
+        """Schedule and last-run details of every job
+
+        Run counts cover this process; ``next_run`` is only known in the
+        process that runs the schedule.
+        """
+        result = []
+        for name, job in self.jobs.items():
+            scheduled = self._scheduler.get_job(name) if self.running else None
+            next_run = getattr(scheduled, 'next_run_time', None) if scheduled else None
+            result.append({
+                'name': name,
+                'interval': job.interval,
+                'priority': job.priority,
+                'jitter_seconds': job.jitter_seconds,
+                'max_concurrency': job.max_concurrency,
+                'missed_run_policy': job.missed_run_policy,
+                'next_run': next_run.isoformat() if next_run else None,
+                'last_run': job.last_run,
+                'last_duration_seconds': job.last_duration_seconds,
+                'last_error': job.last_error,
+                'run_count': job.run_count
+            })
+        return result
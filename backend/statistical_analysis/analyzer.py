@@ -1,18 +1,27 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import PolynomialFeatures
-import json
 import os
 from datetime import datetime, timedelta
+from .hypothesis_testing import TrendHypothesisTester, CORRECTION_METHODS
+from .online_stats import CorrelationAccumulator
+from .concentration import ConcentrationEngine
+from .rollup_cube import RollupCube
+from storage.compact_frames import load_frame
+from utils.serialization import dump_file, load_file
 
 class StatisticalAnalyzer:
     """Advanced statistical analysis for market data"""
 
-    def __init__(self):
-        self.raw_data_dir = os.path.join(os.path.dirname(__file__), '../../data/raw')
-        self.processed_data_dir = os.path.join(os.path.dirname(__file__), '../../data/processed')
+    REGIONAL_NUMERIC_COLS = ['market_size_billions', 'growth_rate', 'number_of_companies',
+                             'avg_service_cost_index', 'digital_maturity', 'labor_cost_index']
+
+    def __init__(self, raw_data_dir=None, processed_data_dir=None):
+        self.raw_data_dir = raw_data_dir or os.path.join(os.path.dirname(__file__), '../../data/raw')
+        self.processed_data_dir = processed_data_dir or os.path.join(os.path.dirname(__file__), '../../data/processed')
+        self.regional_state_file = f"{self.processed_data_dir}/regional_correlation_state.json"
+        self.concentration_engine = ConcentrationEngine()
         os.makedirs(self.processed_data_dir, exist_ok=True)
 
     def refresh_analysis(self):
@@ -25,6 +34,7 @@ class StatisticalAnalyzer:
         self.competitive_analysis()
         self.regional_correlation_analysis()
         self.service_demand_forecasting()
+        self.build_service_demand_cube()
         self.trend_significance_testing()
 
         print("Statistical analysis complete!")
@@ -32,10 +42,7 @@ class StatisticalAnalyzer:
     def analyze_market_growth(self):
         """Analyze market growth with trend analysis and confidence intervals"""
         try:
-            with open(f"{self.raw_data_dir}/market_size.json", 'r') as f:
-                data = json.load(f)
-
-            df = pd.DataFrame(data)
+            df = load_frame(f"{self.raw_data_dir}/market_size.json", 'market_size')
 
             # Linear regression for growth trend
             X = df['year'].values.reshape(-1, 1)
@@ -84,8 +91,7 @@ class StatisticalAnalyzer:
                 }
             }
 
-            with open(f"{self.processed_data_dir}/growth_analysis.json", 'w') as f:
-                json.dump(analysis, f, indent=2)
+            dump_file(analysis, f"{self.processed_data_dir}/growth_analysis.json")
 
             return analysis
         except Exception as e:
@@ -95,10 +101,7 @@ class StatisticalAnalyzer:
     def forecast_market_size(self):
         """Generate forecasts using multiple methods"""
         try:
-            with open(f"{self.raw_data_dir}/market_size.json", 'r') as f:
-                data = json.load(f)
-
-            df = pd.DataFrame(data)
+            df = load_frame(f"{self.raw_data_dir}/market_size.json", 'market_size')
 
             # Separate historical and forecast data
             current_year = 2025
@@ -177,8 +180,7 @@ class StatisticalAnalyzer:
                 }
             }
 
-            with open(f"{self.processed_data_dir}/forecasts.json", 'w') as f:
-                json.dump(forecast_data, f, indent=2)
+            dump_file(forecast_data, f"{self.processed_data_dir}/forecasts.json")
 
             return forecast_data
         except Exception as e:
@@ -188,10 +190,7 @@ class StatisticalAnalyzer:
     def analyze_pricing_trends(self):
         """Statistical analysis of pricing data"""
         try:
-            with open(f"{self.raw_data_dir}/pricing.json", 'r') as f:
-                data = json.load(f)
-
-            df = pd.DataFrame(data)
+            df = load_frame(f"{self.raw_data_dir}/pricing.json", 'pricing')
 
             # Descriptive statistics
             price_stats = {
@@ -233,8 +232,7 @@ class StatisticalAnalyzer:
                 }
             }
 
-            with open(f"{self.processed_data_dir}/pricing_analysis.json", 'w') as f:
-                json.dump(analysis, f, indent=2)
+            dump_file(analysis, f"{self.processed_data_dir}/pricing_analysis.json")
 
             return analysis
         except Exception as e:
@@ -244,18 +242,13 @@ class StatisticalAnalyzer:
     def competitive_analysis(self):
         """Advanced competitive landscape analysis"""
         try:
-            with open(f"{self.raw_data_dir}/competitors.json", 'r') as f:
-                data = json.load(f)
-
-            df = pd.DataFrame(data)
+            df = load_frame(f"{self.raw_data_dir}/competitors.json", 'competitors')
 
-            # Market concentration (Herfindahl-Hirschman Index)
-            hhi = sum((df['market_share'] ** 2))
+            # Market concentration (HHI, CR4), efficiency metrics and leaders via the
+            # grouped engine; the competitor list is one global market at the current period
+            concentration = self.concentration_engine.compute(df.assign(market='Global', period='current'))
+            structure = concentration['summary'].iloc[0]
 
-            # Top 4 concentration ratio
-            cr4 = df.nlargest(4, 'market_share')['market_share'].sum()
-
-            # Efficiency metrics
             df['revenue_per_employee'] = df['revenue_millions'] * 1000000 / df['employee_count']
 
             # Correlation analyses
@@ -270,46 +263,81 @@ class StatisticalAnalyzer:
 
             analysis = {
                 'market_structure': {
-                    'hhi_index': float(hhi),
-                    'market_concentration': 'Highly Concentrated' if hhi > 2500 else 'Moderately Concentrated' if hhi > 1500 else 'Competitive',
-                    'cr4_ratio': float(cr4),
-                    'number_of_players': len(df)
+                    'hhi_index': float(structure['hhi_index']),
+                    'market_concentration': structure['market_concentration'],
+                    'cr4_ratio': float(structure['cr4_ratio']),
+                    'number_of_players': int(structure['number_of_players'])
                 },
                 'efficiency_metrics': {
-                    'avg_revenue_per_employee': float(df['revenue_per_employee'].mean()),
-                    'top_performer': df.nlargest(1, 'revenue_per_employee')[['name', 'revenue_per_employee']].to_dict('records')[0]
+                    'avg_revenue_per_employee': float(structure['avg_revenue_per_employee']),
+                    'top_performer': {
+                        'name': structure['top_performer'],
+                        'revenue_per_employee': float(structure['top_performer_revenue_per_employee'])
+                    }
                 },
                 'correlations': {k: float(v) for k, v in correlations.items()},
                 'performance_distribution': df['performance_quartile'].value_counts().to_dict(),
-                'leaders': df.nlargest(5, 'market_share')[
+                'leaders': concentration['leaders'][
                     ['name', 'market_share', 'growth_rate_yoy', 'customer_satisfaction']
                 ].to_dict('records'),
-                'fastest_growing': df.nlargest(5, 'growth_rate_yoy')[
+                'fastest_growing': concentration['fastest_growing'][
                     ['name', 'growth_rate_yoy', 'market_share']
                 ].to_dict('records')
             }
 
-            with open(f"{self.processed_data_dir}/competitive_analysis.json", 'w') as f:
-                json.dump(analysis, f, indent=2)
+            dump_file(analysis, f"{self.processed_data_dir}/competitive_analysis.json")
 
             return analysis
         except Exception as e:
             print(f"Error in competitive analysis: {e}")
             return {}
 
-    def regional_correlation_analysis(self):
-        """Analyze regional market relationships"""
+    def competitive_concentration_timeseries(self, records, window=None):
+        """HHI, CR4, efficiency and leaders per market and period
+
+        ``records`` are competitor rows carrying ``market`` and ``period``
+        fields, e.g. one period per archived data generation. With ``window``
+        set, metrics over trailing windows of that many periods are added
+        under ``rolling``. The engine caches each period, so only new or
+        changed periods are recomputed between calls.
+        """
         try:
-            with open(f"{self.raw_data_dir}/regional.json", 'r') as f:
-                data = json.load(f)
+            df = pd.DataFrame(records)
+            if df.empty:
+                return {}
+
+            def section(concentration):
+                return {
+                    'groups': concentration['summary'].to_dict('records'),
+                    'leaders': concentration['leaders'][
+                        ['market', 'period', 'rank', 'name', 'market_share']
+                    ].to_dict('records') if not concentration['leaders'].empty else []
+                }
 
-            df = pd.DataFrame(data)
+            analysis = {
+                'periods': sorted(df['period'].unique().tolist()),
+                **section(self.concentration_engine.compute(df, cache_namespace='timeseries')),
+                'window_periods': window
+            }
+            if window:
+                analysis['rolling'] = section(self.concentration_engine.rolling(df, window))
+
+            dump_file(analysis, f"{self.processed_data_dir}/competitive_concentration.json")
+
+            return analysis
+        except Exception as e:
+            print(f"Error in competitive concentration analysis: {e}")
+            return {}
 
-            # Correlation matrix
-            numeric_cols = ['market_size_billions', 'growth_rate', 'number_of_companies',
-                           'avg_service_cost_index', 'digital_maturity', 'labor_cost_index']
+    def regional_correlation_analysis(self):
+        """Analyze regional market relationships"""
+        try:
+            df = load_frame(f"{self.raw_data_dir}/regional.json", 'regional')
 
-            corr_matrix = df[numeric_cols].corr()
+            # Correlation matrix from mergeable sufficient statistics; a refresh
+            # replaces the snapshot, streamed rows go through ingest_regional_observations
+            accumulator = CorrelationAccumulator(self.REGIONAL_NUMERIC_COLS).update_batch(df)
+            accumulator.save(self.regional_state_file)
 
             # Regional rankings
             rankings = {
@@ -326,8 +354,8 @@ class StatisticalAnalyzer:
             )
 
             analysis = {
-                'correlation_matrix': {k: {kk: float(vv) for kk, vv in v.items()}
-                                      for k, v in corr_matrix.to_dict().items()},
+                'correlation_matrix': accumulator.correlation_dict(),
+                'correlation_observations': accumulator.count,
                 'regional_rankings': rankings,
                 'market_potential_ranking': df.nlargest(5, 'market_potential')[
                     ['region', 'market_potential', 'growth_rate', 'digital_maturity']
@@ -342,22 +370,50 @@ class StatisticalAnalyzer:
                 }
             }
 
-            with open(f"{self.processed_data_dir}/regional_analysis.json", 'w') as f:
-                json.dump(analysis, f, indent=2)
+            dump_file(analysis, f"{self.processed_data_dir}/regional_analysis.json")
 
             return analysis
         except Exception as e:
             print(f"Error in regional analysis: {e}")
             return {}
 
+    def ingest_regional_observations(self, observations):
+        """Fold new regional observations into the stored correlation statistics
+
+        Each row costs O(k^2) against the persisted accumulator instead of a
+        full recompute; only the correlation section of the regional analysis
+        is rewritten. Callers publish the result afterwards, as
+        ``POST /api/regional/observations`` does.
+        """
+        try:
+            accumulator = CorrelationAccumulator.load(self.regional_state_file, self.REGIONAL_NUMERIC_COLS)
+            if accumulator.count == 0:
+                # No saved state yet (e.g. before the first regional refresh): start from the current snapshot
+                df = load_frame(f"{self.raw_data_dir}/regional.json", 'regional')
+                accumulator.update_batch(df)
+            for observation in observations:
+                accumulator.update(observation)
+            accumulator.save(self.regional_state_file)
+
+            try:
+                analysis = load_file(f"{self.processed_data_dir}/regional_analysis.json")
+            except FileNotFoundError:
+                analysis = {}
+
+            analysis['correlation_matrix'] = accumulator.correlation_dict()
+            analysis['correlation_observations'] = accumulator.count
+
+            dump_file(analysis, f"{self.processed_data_dir}/regional_analysis.json")
+
+            return analysis
+        except Exception as e:
+            print(f"Error ingesting regional observations: {e}")
+            return {}
+
     def service_demand_forecasting(self):
         """Forecast service demand patterns"""
         try:
-            with open(f"{self.raw_data_dir}/service_demand.json", 'r') as f:
-                data = json.load(f)
-
-            df = pd.DataFrame(data)
-            df['date'] = pd.to_datetime(df['date'])
+            df = load_frame(f"{self.raw_data_dir}/service_demand.json", 'service_demand')
 
             forecasts = {}
 
@@ -401,48 +457,54 @@ class StatisticalAnalyzer:
                 'last_updated': datetime.now().strftime('%Y-%m-%d')
             }
 
-            with open(f"{self.processed_data_dir}/demand_forecasts.json", 'w') as f:
-                json.dump(analysis, f, indent=2)
+            dump_file(analysis, f"{self.processed_data_dir}/demand_forecasts.json")
 
             return analysis
         except Exception as e:
             print(f"Error in demand forecasting: {e}")
             return {}
 
+    def build_service_demand_cube(self):
+        """Materialize the service demand rollup cube for dashboard queries"""
+        try:
+            df = load_frame(f"{self.raw_data_dir}/service_demand.json", 'service_demand')
+
+            cube = RollupCube.build(df)
+            cube.save(f"{self.processed_data_dir}/service_demand_cube.json")
+
+            return cube
+        except Exception as e:
+            print(f"Error building service demand cube: {e}")
+            return None
+
     def trend_significance_testing(self):
         """Statistical significance testing for industry trends"""
         try:
-            with open(f"{self.raw_data_dir}/industry_trends.json", 'r') as f:
-                data = json.load(f)
-
-            df = pd.DataFrame(data)
+            df = load_frame(f"{self.raw_data_dir}/industry_trends.json", 'industry_trends')
 
             # T-test for adoption rates vs. industry average
             industry_avg_adoption = df['adoption_rate'].mean()
 
-            analyses = []
-            for _, row in df.iterrows():
-                # Simulate sample data for hypothesis testing
-                sample_size = 100
-                sample_mean = row['adoption_rate']
-                sample_std = 15  # Assumed standard deviation
-
-                # One-sample t-test
-                t_statistic = (sample_mean - industry_avg_adoption) / (sample_std / np.sqrt(sample_size))
-                p_value = 2 * (1 - stats.t.cdf(abs(t_statistic), sample_size - 1))
-
-                # Effect size (Cohen's d)
-                cohens_d = (sample_mean - industry_avg_adoption) / sample_std
-
-                analyses.append({
-                    'trend': row['trend'],
-                    'adoption_rate': row['adoption_rate'],
-                    'significantly_different': p_value < 0.05,
-                    'p_value': float(p_value),
-                    'effect_size': float(cohens_d),
-                    'interpretation': 'Large' if abs(cohens_d) > 0.8 else 'Medium' if abs(cohens_d) > 0.5 else 'Small',
-                    'investment_roi_potential': float(row['growth_potential'] * row['impact_score'] / 10)
-                })
+            # Simulate sample data for hypothesis testing: n=100, assumed std of 15
+            tester = TrendHypothesisTester(sample_size=100, sample_std=15, correction='fdr_bh')
+            results = tester.run(df, value_col='adoption_rate')
+
+            analyses = [
+                {
+                    'trend': trend,
+                    'adoption_rate': float(adoption_rate),
+                    'significantly_different': bool(result['significantly_different']),
+                    'p_value': float(result['p_value']),
+                    'p_value_adjusted': float(result['p_value_adjusted']),
+                    'significant_after_correction': bool(result['significant_after_correction']),
+                    'effect_size': float(result['effect_size']),
+                    'interpretation': result['interpretation'],
+                    'investment_roi_potential': float(result['investment_roi_potential'])
+                }
+                for trend, adoption_rate, result in zip(
+                    df['trend'], df['adoption_rate'], results.to_dict('records')
+                )
+            ]
 
             # Correlation between investment and growth
             investment_growth_corr = df[['investment_millions', 'growth_potential']].corr().iloc[0, 1]
@@ -454,12 +516,13 @@ class StatisticalAnalyzer:
                 'top_roi_trends': sorted(analyses, key=lambda x: x['investment_roi_potential'], reverse=True)[:3],
                 'statistical_summary': {
                     'significant_trends_count': sum(1 for a in analyses if a['significantly_different']),
+                    'significant_after_correction_count': sum(1 for a in analyses if a['significant_after_correction']),
+                    'correction_method': CORRECTION_METHODS[tester.correction],
                     'total_trends': len(analyses)
                 }
             }
 
-            with open(f"{self.processed_data_dir}/trend_significance.json", 'w') as f:
-                json.dump(analysis, f, indent=2)
+            dump_file(analysis, f"{self.processed_data_dir}/trend_significance.json")
 
             return analysis
         except Exception as e:
@@ -0,0 +1,154 @@
+import pandas as pd
+import numpy as np
+
+
+def concentration_label(hhi):
+    """Vectorized DOJ-style market concentration classification of HHI values"""
+    hhi = np.asarray(hhi, dtype=float)
+    return np.where(hhi > 2500, 'Highly Concentrated',
+                    np.where(hhi > 1500, 'Moderately Concentrated', 'Competitive'))
+
+
+def grouped_rank(values, group_ids):
+    """Order rows by group then descending value, and rank each row within its group
+
+    Returns ``(order, rank)`` where ``order`` indexes the input rows and
+    ``rank[i]`` is the 0-based position of ``order[i]`` inside its group.
+    The sort is stable, so ties keep their input order like ``nlargest``.
+    """
+    order = np.lexsort((-values, group_ids))
+    sorted_groups = group_ids[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_groups)) + 1]
+    counts = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, counts)
+    return order, rank
+
+
+class ConcentrationEngine:
+    """Batched HHI / CR4 / efficiency / leader metrics over market x period groups
+
+    All groups are computed in one grouped sort with ``np.bincount``
+    reductions. Results are cached per period together with a fingerprint of
+    that period's rows, so a refresh only recomputes new or revised periods.
+    """
+
+    def __init__(self, market_col='market', period_col='period', name_col='name',
+                 share_col='market_share', top_n=5, cr_k=4):
+        self.market_col = market_col
+        self.period_col = period_col
+        self.name_col = name_col
+        self.share_col = share_col
+        self.top_n = top_n
+        self.cr_k = cr_k
+        self._cache = {}
+
+    def clear_cache(self):
+        """Drop every cached period"""
+        self._cache.clear()
+
+    def _compute_groups(self, df):
+        """Compute all metrics for every (market, period) group in df"""
+        df = df.reset_index(drop=True)
+        keys = pd.MultiIndex.from_frame(df[[self.market_col, self.period_col]])
+        group_ids, groups = keys.factorize()
+        n_groups = len(groups)
+
+        share = df[self.share_col].to_numpy(dtype=float)
+        players = np.bincount(group_ids, minlength=n_groups)
+        hhi = np.bincount(group_ids, weights=share ** 2, minlength=n_groups)
+
+        order, rank = grouped_rank(share, group_ids)
+        in_top_k = rank < self.cr_k
+        cr_k = np.bincount(group_ids[order][in_top_k], weights=share[order][in_top_k], minlength=n_groups)
+
+        summary = pd.DataFrame({
+            self.market_col: groups.get_level_values(0),
+            self.period_col: groups.get_level_values(1),
+            'hhi_index': hhi,
+            'market_concentration': concentration_label(hhi),
+            f'cr{self.cr_k}_ratio': cr_k,
+            'number_of_players': players
+        })
+
+        if {'revenue_millions', 'employee_count'}.issubset(df.columns):
+            revenue_per_employee = (df['revenue_millions'].to_numpy(dtype=float) * 1000000 /
+                                    df['employee_count'].to_numpy(dtype=float))
+            summary['avg_revenue_per_employee'] = (
+                np.bincount(group_ids, weights=revenue_per_employee, minlength=n_groups) / players
+            )
+            rpe_order, rpe_rank = grouped_rank(revenue_per_employee, group_ids)
+            top = rpe_order[rpe_rank == 0]
+            summary.loc[group_ids[top], 'top_performer'] = df[self.name_col].to_numpy()[top]
+            summary.loc[group_ids[top], 'top_performer_revenue_per_employee'] = revenue_per_employee[top]
+
+        leaders = df.iloc[order[rank < self.top_n]].assign(rank=rank[rank < self.top_n] + 1)
+
+        fastest_growing = None
+        if 'growth_rate_yoy' in df.columns:
+            growth_order, growth_rank = grouped_rank(df['growth_rate_yoy'].to_numpy(dtype=float), group_ids)
+            keep = growth_rank < self.top_n
+            fastest_growing = df.iloc[growth_order[keep]].assign(rank=growth_rank[keep] + 1)
+
+        return summary, leaders, fastest_growing
+
+    def _period_fingerprints(self, df):
+        """Content hash of each period's rows"""
+        hashes = pd.util.hash_pandas_object(df, index=False)
+        return hashes.groupby(df[self.period_col].to_numpy()).sum().to_dict()
+
+    def compute(self, df, cache_namespace='snapshot'):
+        """Metrics for every market x period, recomputing only uncached periods
+
+        Returns a dict of DataFrames: ``summary`` (one row per group),
+        ``leaders`` and ``fastest_growing`` (top-n rows per group with a
+        1-based ``rank`` column).
+        """
+        fingerprints = self._period_fingerprints(df)
+        stale = [period for period, fingerprint in fingerprints.items()
+                 if self._cache.get((cache_namespace, period), (None,))[0] != fingerprint]
+
+        if stale:
+            fresh = df[df[self.period_col].isin(stale)]
+            summary, leaders, fastest_growing = self._compute_groups(fresh)
+            for period in stale:
+                self._cache[(cache_namespace, period)] = (
+                    fingerprints[period],
+                    summary[summary[self.period_col] == period],
+                    leaders[leaders[self.period_col] == period],
+                    None if fastest_growing is None else
+                    fastest_growing[fastest_growing[self.period_col] == period]
+                )
+
+        periods = sorted(fingerprints)
+        cached = [self._cache[(cache_namespace, period)] for period in periods]
+        fastest_parts = [entry[3] for entry in cached if entry[3] is not None]
+        return {
+            'summary': pd.concat([entry[1] for entry in cached], ignore_index=True),
+            'leaders': pd.concat([entry[2] for entry in cached], ignore_index=True),
+            'fastest_growing': pd.concat(fastest_parts, ignore_index=True) if fastest_parts else None
+        }
+
+    def rolling(self, df, window):
+        """Metrics over trailing windows of ``window`` periods per market
+
+        Each company's numeric metrics are averaged across the periods in the
+        window ending at each period, then concentration is computed on those
+        averages. Windows are cached like single periods.
+        """
+        periods = np.sort(df[self.period_col].unique())
+        position = pd.Series(np.arange(len(periods)), index=periods)
+        period_pos = position.loc[df[self.period_col]].to_numpy()
+
+        # Each row contributes to the windows ending at its own and the next window-1 periods
+        frames = []
+        for offset in range(window):
+            end_pos = period_pos + offset
+            valid = (end_pos < len(periods)) & (end_pos >= window - 1)
+            frames.append(df[valid].assign(**{self.period_col: periods[end_pos[valid]]}))
+        expanded = pd.concat(frames, ignore_index=True)
+        if expanded.empty:
+            return {'summary': pd.DataFrame(), 'leaders': pd.DataFrame(), 'fastest_growing': None}
+
+        averaged = (expanded.groupby([self.market_col, self.period_col, self.name_col], sort=False)
+                    .mean(numeric_only=True).reset_index())
+        return self.compute(averaged, cache_namespace=f'rolling:{window}')
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+# Named resolutions for clients that do not know their chart width
+RESOLUTION_POINTS = {'low': 100, 'medium': 500, 'high': 2000}
+
+MIN_POINTS = 3
+MAX_POINTS = 100000
+
+
+def resolve_max_points(max_points=None, resolution=None):
+    """Points per series from an explicit ``max_points`` or a named ``resolution``
+
+    Returns None when neither is given, i.e. no downsampling was requested.
+    """
+    if max_points is not None:
+        try:
+            points = int(max_points)
+        except (TypeError, ValueError):
+            raise ValueError(f"max_points must be an integer, got {max_points!r}")
+        if not MIN_POINTS <= points <= MAX_POINTS:
+            raise ValueError(f"max_points must be between {MIN_POINTS} and {MAX_POINTS}")
+        return points
+    if resolution is not None:
+        if resolution not in RESOLUTION_POINTS:
+            raise ValueError(f"resolution must be one of {', '.join(RESOLUTION_POINTS)}")
+        return RESOLUTION_POINTS[resolution]
+    return None
+
+
+def _interior_buckets(n, n_buckets):
+    """Start and end positions of ``n_buckets`` equal-count buckets over points 1..n-2"""
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    return edges[:-1], edges[1:]
+
+
+def lttb_indices(x, y, max_points):
+    """Largest-Triangle-Three-Buckets selection of at most ``max_points`` indices
+
+    Keeps the first and last point and, from every interior bucket, the point
+    forming the largest triangle with the previously selected point and the
+    next bucket's centroid. Bucket centroids come from one ``reduceat``; each
+    bucket's triangle areas are a single vectorized expression.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+
+    starts, ends = _interior_buckets(n, max_points - 2)
+    counts = ends - starts
+    mean_x = np.add.reduceat(x[:n - 1], starts) / counts
+    mean_y = np.add.reduceat(y[:n - 1], starts) / counts
+    # The last bucket looks ahead to the final point rather than a centroid
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - next_x[i]) * (by - y[a]) - (x[a] - bx) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def min_points(method, n_cols=1):
+    """Smallest ``max_points`` a method can honour for ``n_cols`` value columns
+
+    Min/max bucketing needs both endpoints plus a minimum and a maximum of
+    every column for at least one bucket.
+    """
+    return 2 + 2 * n_cols if method == 'minmax' else MIN_POINTS
+
+
+def minmax_indices(x, y, max_points):
+    """Per-bucket minimum and maximum of every column of ``y``, plus both endpoints
+
+    ``y`` may be one- or two-dimensional; the bucket count shrinks with the
+    number of columns so the result never exceeds ``max_points``. Extremes
+    are found for all buckets at once with ``reduceat``.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    if y.ndim == 1:
+        y = y[:, None]
+    n, n_cols = y.shape
+    if max_points < min_points('minmax', n_cols):
+        raise ValueError(f"max_points must be at least {min_points('minmax', n_cols)} "
+                         f"for minmax over {n_cols} value columns")
+    if n <= max_points:
+        return np.arange(n)
+
+    n_buckets = (max_points - 2) // (2 * n_cols)
+    starts, ends = _interior_buckets(n, n_buckets)
+    counts = ends - starts
+    bucket_ids = np.repeat(np.arange(n_buckets), counts)
+
+    selected = [np.array([0, n - 1])]
+    for col in range(n_cols):
+        interior = y[1:n - 1, col]
+        for reduce in (np.minimum, np.maximum):
+            extreme = np.repeat(reduce.reduceat(interior, starts - 1), counts)
+            hits = np.flatnonzero(interior == extreme)
+            # First hit per bucket; buckets whose extreme is NaN have none
+            _, first = np.unique(bucket_ids[hits], return_index=True)
+            selected.append(hits[first] + 1)
+    return np.unique(np.concatenate(selected))
+
+
+DOWNSAMPLING_METHODS = {
+    'lttb': lttb_indices,
+    'minmax': minmax_indices
+}
+
+
+def _numeric_axis(values):
+    """Float x positions for numbers, dates or date strings"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64)
+    return pd.to_datetime(values).to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+
+
+def downsample_records(records, x, y, max_points, method='lttb', group=None):
+    """Shape-preserving subset of time-series records, in their original order
+
+    ``y`` lists the value columns: LTTB follows the first one, min/max
+    bucketing keeps the extremes of all of them. With ``group`` each series
+    (e.g. each service type) is downsampled to ``max_points`` on its own.
+    Rows with a missing x or primary value are dropped.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"method must be one of {', '.join(DOWNSAMPLING_METHODS)}")
+    if not records:
+        return records
+
+    df = pd.DataFrame.from_records(records)
+    xs = _numeric_axis(df[x])
+    ys = df[y].to_numpy(dtype=np.float64)
+    values = ys[:, 0] if method == 'lttb' else ys
+    valid = np.isfinite(xs) & np.isfinite(ys[:, 0])
+
+    if group is None:
+        group_ids = np.zeros(len(df), dtype=np.int64)
+    else:
+        group_ids, _ = pd.factorize(df[group])
+
+    # Each series in x order; stable, so ties keep their input order
+    order = np.lexsort((xs, group_ids))
+    order = order[valid[order]]
+    sorted_groups = group_ids[order]
+    boundaries = np.flatnonzero(np.diff(sorted_groups)) + 1
+
+    select = DOWNSAMPLING_METHODS[method]
+    keep = [rows[select(xs[rows], values[rows], max_points)]
+            for rows in np.split(order, boundaries) if len(rows)]
+    keep = np.sort(np.concatenate(keep)) if keep else np.array([], dtype=np.int64)
+    return [records[i] for i in keep]
@@ -0,0 +1,131 @@
+import numpy as np
+import os
+from utils.serialization import dump_file, load_file
+
+
+class CorrelationAccumulator:
+    """Mergeable running covariance/correlation over a fixed set of columns
+
+    Holds the sufficient statistics (count, column means and the co-moment
+    matrix) so new observations can be folded in with a Welford update in
+    O(k^2) per row, and partial accumulators built on separate chunks or
+    workers can be combined exactly with ``merge`` (Chan et al. pairwise
+    update). Rows containing NaN are skipped.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    def _as_matrix(self, observations):
+        """Convert a DataFrame, list of dicts or 2-D array to a float matrix"""
+        if hasattr(observations, 'reindex'):
+            values = observations.reindex(columns=self.columns).to_numpy(dtype=float)
+        elif len(observations) and isinstance(observations[0], dict):
+            values = np.array([[row.get(col, np.nan) for col in self.columns] for row in observations], dtype=float)
+        else:
+            values = np.asarray(observations, dtype=float)
+        values = values.reshape(-1, len(self.columns))
+        return values[~np.isnan(values).any(axis=1)]
+
+    def update(self, observation):
+        """Fold a single observation (dict or sequence) into the statistics"""
+        if isinstance(observation, dict):
+            x = np.array([observation.get(col, np.nan) for col in self.columns], dtype=float)
+        else:
+            x = np.asarray(observation, dtype=float)
+        if np.isnan(x).any():
+            return self
+
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.comoment += np.outer(delta, x - self.mean)
+        return self
+
+    def update_batch(self, observations):
+        """Fold a chunk of observations in by building and merging a partial accumulator"""
+        values = self._as_matrix(observations)
+        if len(values) == 0:
+            return self
+
+        chunk = CorrelationAccumulator(self.columns)
+        chunk.count = len(values)
+        chunk.mean = values.mean(axis=0)
+        centered = values - chunk.mean
+        chunk.comoment = centered.T @ centered
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Combine another accumulator over the same columns into this one"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns")
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.comoment = other.comoment.copy()
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.count * other.count / total
+        self.mean = self.mean + delta * other.count / total
+        self.count = total
+        return self
+
+    def covariance(self, ddof=1):
+        """Sample covariance matrix (NaN until enough observations are seen)"""
+        if self.count - ddof <= 0:
+            return np.full(self.comoment.shape, np.nan)
+        return self.comoment / (self.count - ddof)
+
+    def correlation(self):
+        """Pearson correlation matrix; constant columns yield NaN like pandas"""
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.outer(std, std)
+        corr[~np.isfinite(corr)] = np.nan
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return corr
+
+    def correlation_dict(self):
+        """Correlation matrix as a nested {column: {column: value}} dict"""
+        corr = self.correlation()
+        return {col: {other: float(corr[j, i]) for j, other in enumerate(self.columns)}
+                for i, col in enumerate(self.columns)}
+
+    def to_dict(self):
+        """Serializable snapshot of the sufficient statistics"""
+        return {
+            'columns': self.columns,
+            'count': int(self.count),
+            'mean': self.mean.tolist(),
+            'comoment': self.comoment.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild an accumulator from ``to_dict`` output"""
+        acc = cls(state['columns'])
+        acc.count = int(state['count'])
+        acc.mean = np.array(state['mean'], dtype=float)
+        acc.comoment = np.array(state['comoment'], dtype=float)
+        return acc
+
+    def save(self, filepath):
+        """Persist the sufficient statistics to a JSON file"""
+        dump_file(self.to_dict(), filepath)
+
+    @classmethod
+    def load(cls, filepath, columns):
+        """Load persisted statistics, or start empty if missing or for other columns"""
+        if os.path.exists(filepath):
+            state = load_file(filepath)
+            if state.get('columns') == list(columns):
+                return cls.from_dict(state)
+        return cls(columns)
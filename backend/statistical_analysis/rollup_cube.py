@@ -0,0 +1,172 @@
+import pandas as pd
+from itertools import combinations
+from utils.serialization import dump_file, load_file
+
+TIME_LEVELS = ['year', 'quarter', 'month']
+STATS = ['sum', 'count', 'mean', 'min', 'max']
+
+
+class RollupCube:
+    """Materialized sum/count/mean/min/max aggregates over time x category dimensions
+
+    Every combination of a time level (none, year, quarter or month) with any
+    subset of the categorical dimensions is pre-aggregated once at build
+    time. A time level keeps its coarser parents as key columns, so a month
+    cuboid can still be filtered by year. Queries are dictionary lookups and
+    small scans over one cuboid and never touch the raw rows.
+    """
+
+    def __init__(self, dimensions, measures):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.cuboids = {}
+        self._point_indexes = {}
+
+    @staticmethod
+    def _cuboid_dims(time_level, dims):
+        """Key columns of a cuboid: the time hierarchy prefix, then categorical dims"""
+        time_dims = TIME_LEVELS[:TIME_LEVELS.index(time_level) + 1] if time_level else []
+        return tuple(time_dims) + tuple(dims)
+
+    @classmethod
+    def build(cls, df, date_col='date', dimensions=('service_type', 'region'),
+              measures=('demand_score', 'avg_ticket_value', 'volume')):
+        """Aggregate a raw frame into every cuboid of the cube
+
+        Dimensions missing from ``df`` are skipped, so the same call covers
+        data with or without a region column.
+        """
+        dates = pd.to_datetime(df[date_col])
+        frame = df.assign(
+            year=dates.dt.year.astype(str),
+            quarter=dates.dt.year.astype(str) + 'Q' + dates.dt.quarter.astype(str),
+            month=dates.dt.strftime('%Y-%m')
+        )
+        cube = cls([d for d in dimensions if d in df.columns], [m for m in measures if m in df.columns])
+
+        for time_level in [None] + TIME_LEVELS:
+            for size in range(len(cube.dimensions) + 1):
+                for dims in combinations(cube.dimensions, size):
+                    key_dims = cls._cuboid_dims(time_level, dims)
+                    cube.cuboids[key_dims] = cube._aggregate(frame, key_dims)
+        return cube
+
+    def _aggregate(self, frame, key_dims):
+        """Aggregate every measure for one cuboid into {key tuple: {measure: {stat: value}}}"""
+        stats = ['sum', 'count', 'min', 'max']
+        if key_dims:
+            grouped = frame.groupby(list(key_dims), sort=True, observed=True)[self.measures].agg(stats)
+        else:
+            grouped = frame[self.measures].agg(stats).unstack().to_frame().T
+
+        cells = {}
+        for key, row in zip(grouped.index, grouped.to_numpy()):
+            key = key if isinstance(key, tuple) else (key,)
+            values = dict(zip(grouped.columns, row))
+            cells[key if key_dims else ()] = {
+                measure: {
+                    'sum': float(values[(measure, 'sum')]),
+                    'count': int(values[(measure, 'count')]),
+                    'mean': float(values[(measure, 'sum')] / values[(measure, 'count')])
+                    if values[(measure, 'count')] else float('nan'),
+                    'min': float(values[(measure, 'min')]),
+                    'max': float(values[(measure, 'max')])
+                }
+                for measure in self.measures
+            }
+        return cells
+
+    @staticmethod
+    def _core_dims(key_dims):
+        """Key columns without the coarser time parents implied by the finest level"""
+        time_dims = [d for d in key_dims if d in TIME_LEVELS]
+        return tuple(d for d in key_dims if d not in time_dims[:-1])
+
+    def _point_index(self, key_dims):
+        """Map core key tuples to full cuboid keys, built on first use"""
+        if key_dims not in self._point_indexes:
+            positions = [key_dims.index(d) for d in self._core_dims(key_dims)]
+            self._point_indexes[key_dims] = {tuple(key[i] for i in positions): key
+                                             for key in self.cuboids[key_dims]}
+        return self._point_indexes[key_dims]
+
+    def _select_cuboid(self, by, filters):
+        """Smallest cuboid whose key columns cover the group-by and filter dims"""
+        needed = set(by) | set(filters)
+        unknown = needed - set(TIME_LEVELS) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"Unknown cube dimensions: {sorted(unknown)}")
+
+        requested_levels = [level for level in TIME_LEVELS if level in needed]
+        time_level = requested_levels[-1] if requested_levels else None
+        dims = tuple(d for d in self.dimensions if d in needed)
+        return self._cuboid_dims(time_level, dims)
+
+    def query(self, by=(), measures=None, stats=None, **filters):
+        """Slice/dice the cube
+
+        ``by`` lists the dimensions to break results down by, keyword
+        filters fix dimension values (e.g. ``service_type='Inspections'``,
+        ``year='2024'``). Returns a list of rows holding the ``by`` dims and a
+        ``{measure: {stat: value}}`` mapping per row.
+        """
+        by = list(by)
+        measures = list(measures or self.measures)
+        stats = list(stats or STATS)
+        unknown = set(measures) - set(self.measures)
+        if unknown:
+            raise ValueError(f"Unknown cube measures: {sorted(unknown)}")
+        unknown = set(stats) - set(STATS)
+        if unknown:
+            raise ValueError(f"Unknown cube stats: {sorted(unknown)}")
+        filters = {k: str(v) for k, v in filters.items() if v is not None}
+        key_dims = self._select_cuboid(by, filters)
+        cells = self.cuboids[key_dims]
+
+        # Point lookup when the finest time level and every categorical key column are fixed
+        core_dims = self._core_dims(key_dims)
+        if set(core_dims) <= set(filters) and not set(by) - set(filters):
+            key = self._point_index(key_dims).get(tuple(filters[d] for d in core_dims))
+            positions = [(key_dims.index(d), v) for d, v in filters.items()]
+            matches = [(key, cells[key])] if key and all(key[i] == v for i, v in positions) else []
+        else:
+            positions = [(key_dims.index(d), v) for d, v in filters.items()]
+            matches = [(key, cell) for key, cell in cells.items()
+                       if all(key[i] == v for i, v in positions)]
+
+        # Cuboid keys can carry coarser time parents not requested in `by`; they never split groups
+        return [
+            {
+                **{d: key[key_dims.index(d)] for d in by},
+                **{m: {s: cell[m][s] for s in stats} for m in measures}
+            }
+            for key, cell in matches
+        ]
+
+    def to_dict(self):
+        """Serializable form of the materialized cube"""
+        return {
+            'dimensions': self.dimensions,
+            'measures': self.measures,
+            'cuboids': [
+                {'dims': list(key_dims), 'cells': [{'key': list(key), 'values': cell} for key, cell in cells.items()]}
+                for key_dims, cells in self.cuboids.items()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild a cube from ``to_dict`` output"""
+        cube = cls(state['dimensions'], state['measures'])
+        for cuboid in state['cuboids']:
+            cube.cuboids[tuple(cuboid['dims'])] = {tuple(cell['key']): cell['values'] for cell in cuboid['cells']}
+        return cube
+
+    def save(self, filepath):
+        """Write the cube to a JSON file"""
+        dump_file(self.to_dict(), filepath)
+
+    @classmethod
+    def load(cls, filepath):
+        """Read a cube written by ``save``"""
+        return cls.from_dict(load_file(filepath))
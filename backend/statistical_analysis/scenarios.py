@@ -0,0 +1,249 @@
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.serialization import dumps, dump_file, load_file
+
+SEGMENT_SHARES = {'residential': 0.62, 'commercial': 0.28, 'industrial': 0.10}
+
+DEFAULT_PARAMETERS = {
+    'horizon_years': 5,
+    'n_paths': 20000,
+    'growth_mean': 0.063,
+    'growth_vol': 0.02,
+    'idiosyncratic_vol': 0.01,
+    'shock_probability': 0.05,
+    'shock_mean': -0.08,
+    'shock_vol': 0.04,
+    'seed': 42
+}
+
+PARAMETER_LIMITS = {
+    'horizon_years': (1, 30),
+    'n_paths': (100, 500000),
+    'growth_mean': (-0.5, 0.5),
+    'growth_vol': (0, 1),
+    'idiosyncratic_vol': (0, 1),
+    'shock_probability': (0, 1),
+    'shock_mean': (-0.99, 0.5),
+    'shock_vol': (0, 1),
+    'seed': (0, 2 ** 32 - 1)
+}
+
+# Largest n_paths x horizon x (total + segments + regions + cells) held at once
+MAX_SIMULATED_VALUES = 20_000_000
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def _simulate_chunk(seed, n_paths, horizon, base_cells, growth_mean, growth_vol, idiosyncratic_vol,
+                    shock_probability, shock_mean, shock_vol):
+    """Simulate market-size paths for every segment x region cell
+
+    A common market growth draw plus Bernoulli-timed shocks drives all cells,
+    with independent per-cell noise on top. Returns an array of shape
+    (n_paths, horizon, n_cells).
+    """
+    rng = np.random.default_rng(seed)
+    common = rng.normal(growth_mean, growth_vol, (n_paths, horizon))
+    shocks = (rng.random((n_paths, horizon)) < shock_probability) * rng.normal(shock_mean, shock_vol, (n_paths, horizon))
+    idiosyncratic = rng.normal(0, idiosyncratic_vol, (n_paths, horizon, len(base_cells)))
+
+    log_growth = np.log1p(np.maximum(common + shocks, -0.99))[:, :, None] + idiosyncratic
+    return base_cells * np.exp(np.cumsum(log_growth, axis=1))
+
+
+class ScenarioEngine:
+    """Monte Carlo market-size scenarios per segment and region
+
+    Paths are simulated in fixed-size chunks with independent child seeds, so
+    results depend only on the parameters and not on the number of workers.
+    Large runs fan chunks out over a process pool; runs whose paths would
+    exceed ``MAX_SIMULATED_VALUES`` are rejected up front. Percentile bands
+    are cached in memory and on disk under a hash of the resolved parameters
+    and base market inputs, so a new data generation invalidates them
+    automatically. The disk cache keeps the ``disk_cache_size`` most
+    recently used results.
+    """
+
+    def __init__(self, raw_data_dir, cache_dir, chunk_size=5000, max_workers=None, memory_cache_size=32,
+                 disk_cache_size=256):
+        self.raw_data_dir = raw_data_dir
+        self.cache_dir = cache_dir
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.memory_cache_size = memory_cache_size
+        self.disk_cache_size = disk_cache_size
+        self._memory_cache = OrderedDict()
+        self._executor = None
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _executor_for(self, n_chunks):
+        """Shared process pool, created on first multi-chunk run"""
+        if n_chunks <= 1:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def base_market(self, current_year=2025):
+        """Current market size split into segment x region cells from the raw data"""
+        market_size = load_file(f"{self.raw_data_dir}/market_size.json")
+        regional = load_file(f"{self.raw_data_dir}/regional.json")
+
+        current = [row for row in market_size if row['year'] <= current_year][-1]
+        total = current['market_size_billions']
+        segments = {name: current.get(f'segment_{name}', total * share) / total
+                    for name, share in SEGMENT_SHARES.items()}
+
+        regional_total = sum(row['market_size_billions'] for row in regional)
+        regions = {row['region']: row['market_size_billions'] / regional_total for row in regional}
+
+        return {'year': current['year'], 'total': total, 'segments': segments, 'regions': regions}
+
+    def resolve_parameters(self, overrides=None):
+        """Merge overrides into the defaults and validate them"""
+        parameters = dict(DEFAULT_PARAMETERS)
+        for key, value in (overrides or {}).items():
+            if key not in DEFAULT_PARAMETERS:
+                raise ValueError(f"Unknown scenario parameter: {key}")
+            if isinstance(value, bool):
+                raise ValueError(f"{key} must be a number")
+            try:
+                parameters[key] = int(value) if isinstance(DEFAULT_PARAMETERS[key], int) else float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a number")
+            if not math.isfinite(parameters[key]):
+                raise ValueError(f"{key} must be a finite number")
+
+        for key, (low, high) in PARAMETER_LIMITS.items():
+            if not low <= parameters[key] <= high:
+                raise ValueError(f"{key} must be between {low} and {high}")
+        return parameters
+
+    def parameter_hash(self, parameters, base):
+        """Stable hash of everything that determines a simulation result"""
+        key = dumps({'parameters': parameters, 'base': base, 'chunk_size': self.chunk_size,
+                     'percentiles': PERCENTILES})
+        return hashlib.sha256(key).hexdigest()[:16]
+
+    def check_size(self, parameters, base):
+        """Reject runs whose simulated paths would not fit the memory budget"""
+        n_segments, n_regions = len(base['segments']), len(base['regions'])
+        n_views = 1 + n_segments + n_regions + n_segments * n_regions
+        values = parameters['n_paths'] * parameters['horizon_years'] * n_views
+        if values > MAX_SIMULATED_VALUES:
+            raise ValueError(f"n_paths x horizon_years is too large for {n_views} market views: "
+                             f"at most {MAX_SIMULATED_VALUES // n_views} path-years")
+
+    def simulate(self, overrides=None):
+        """Percentile bands for total, segment, region and segment x region market size"""
+        parameters = self.resolve_parameters(overrides)
+        base = self.base_market()
+        self.check_size(parameters, base)
+        digest = self.parameter_hash(parameters, base)
+
+        with self._lock:
+            cached = self._memory_cache.get(digest)
+            if cached is not None:
+                self._memory_cache.move_to_end(digest)
+                return cached
+
+        cache_file = f"{self.cache_dir}/{digest}.json"
+        try:
+            result = load_file(cache_file)
+            os.utime(cache_file)
+        except FileNotFoundError:
+            result = self._run(parameters, base, digest)
+            dump_file(result, cache_file)
+            self._prune_disk_cache()
+
+        with self._lock:
+            self._memory_cache[digest] = result
+            while len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+        return result
+
+    def _prune_disk_cache(self):
+        """Delete the least recently used cached results beyond disk_cache_size"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        for _, path in sorted(entries)[:-self.disk_cache_size]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _run(self, parameters, base, digest):
+        """Simulate all chunks and reduce them to percentile bands"""
+        segment_names = list(base['segments'])
+        region_names = list(base['regions'])
+        segment_shares = np.array([base['segments'][s] for s in segment_names])
+        region_shares = np.array([base['regions'][r] for r in region_names])
+        base_cells = base['total'] * np.outer(segment_shares, region_shares).ravel()
+
+        horizon = parameters['horizon_years']
+        n_paths = parameters['n_paths']
+        sizes = [self.chunk_size] * (n_paths // self.chunk_size)
+        if n_paths % self.chunk_size:
+            sizes.append(n_paths % self.chunk_size)
+        seeds = np.random.SeedSequence(parameters['seed']).spawn(len(sizes))
+
+        args = [(seed, size, horizon, base_cells, parameters['growth_mean'], parameters['growth_vol'],
+                 parameters['idiosyncratic_vol'], parameters['shock_probability'],
+                 parameters['shock_mean'], parameters['shock_vol'])
+                for seed, size in zip(seeds, sizes)]
+        executor = self._executor_for(len(args))
+        chunks = map(_simulate_chunk, *zip(*args)) if executor is None else executor.map(_simulate_chunk, *zip(*args))
+
+        # Fill one preallocated array as chunks arrive instead of concatenating copies
+        n_segments, n_regions = len(segment_names), len(region_names)
+        grid = np.empty((n_paths, horizon, n_segments, n_regions))
+        offset = 0
+        for chunk in chunks:
+            grid[offset:offset + len(chunk)] = chunk.reshape(len(chunk), horizon, n_segments, n_regions)
+            offset += len(chunk)
+
+        # Percentiles per view, so no combined copy of every view is ever built
+        total = grid.sum(axis=(2, 3))
+        bands = np.concatenate([
+            np.percentile(total, PERCENTILES, axis=0)[:, :, None],
+            np.percentile(grid.sum(axis=3), PERCENTILES, axis=0),
+            np.percentile(grid.sum(axis=2), PERCENTILES, axis=0),
+            np.percentile(grid.reshape(n_paths, horizon, -1), PERCENTILES, axis=0)
+        ], axis=2)
+
+        labels = (['total'] + [f'segment:{s}' for s in segment_names] + [f'region:{r}' for r in region_names] +
+                  [f'cell:{s}|{r}' for s in segment_names for r in region_names])
+
+        def band(index):
+            return {f'p{q}': bands[i, :, index].tolist() for i, q in enumerate(PERCENTILES)}
+
+        result = {
+            'parameters': parameters,
+            'parameter_hash': digest,
+            'base_year': base['year'],
+            'base_market_size_billions': base['total'],
+            'years': list(range(base['year'] + 1, base['year'] + horizon + 1)),
+            'percentiles': PERCENTILES,
+            'total': band(0),
+            'segments': {}, 'regions': {}, 'segment_region': {},
+            'probability_of_decline': float((total[:, -1] < base['total']).mean())
+        }
+        for index, label in enumerate(labels[1:], start=1):
+            kind, name = label.split(':', 1)
+            target = {'segment': 'segments', 'region': 'regions', 'cell': 'segment_region'}[kind]
+            result[target][name] = band(index)
+        return result
@@ -0,0 +1,107 @@
+import pandas as pd
+import json
+import os
+
+RAW_DATA_DIR = os.path.join(os.path.dirname(__file__), '../../data/raw')
+
+# Low-cardinality string fields stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = {
+    'pricing': ['price_trend'],
+    'regional': ['regulatory_complexity'],
+    'service_demand': ['service_type'],
+    'industry_trends': ['maturity']
+}
+
+# Integer fields stored in the narrowest type holding their range. Only
+# counts, years and amounts that are summed, compared or divided are listed;
+# revenue_millions is left at int64 because it is multiplied by 1000000.
+NARROW_INTEGER_COLUMNS = {
+    'market_size': ['year'],
+    'competitors': ['employee_count'],
+    'regional': ['number_of_companies'],
+    'service_demand': ['volume'],
+    'industry_trends': ['investment_millions']
+}
+
+# Date fields parsed once to datetime64, with their on-disk format
+DATE_COLUMNS = {
+    'service_demand': {'date': '%Y-%m'}
+}
+
+RAW_DATASETS = ['market_size', 'pricing', 'competitors', 'regional', 'service_demand', 'industry_trends']
+
+
+def compact_frame(records, dataset=None):
+    """Build a memory-compact DataFrame from a list of record dicts
+
+    Known low-cardinality strings become categoricals, dates are parsed to
+    datetime64 and the integer columns in ``NARROW_INTEGER_COLUMNS`` shrink
+    to the narrowest type holding their values. Other numeric columns keep
+    int64/float64 so arithmetic such as ``revenue * 1000000`` cannot overflow.
+    """
+    df = pd.DataFrame(records)
+
+    for col, fmt in DATE_COLUMNS.get(dataset, {}).items():
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=fmt)
+
+    categorical = CATEGORICAL_COLUMNS.get(dataset)
+    if categorical is None:
+        # Unknown dataset: dictionary-encode strings repeated at least twice on average
+        categorical = [col for col in df.select_dtypes(include='object').columns
+                       if df[col].map(type).eq(str).all() and df[col].nunique() <= len(df) / 2]
+    for col in categorical:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    for col in NARROW_INTEGER_COLUMNS.get(dataset, []):
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+
+    return df
+
+
+def load_frame(filepath, dataset=None):
+    """Load a JSON record file straight into a compact DataFrame"""
+    with open(filepath, 'r') as f:
+        return compact_frame(json.load(f), dataset)
+
+
+def memory_report(raw_dir=None):
+    """Bytes per raw dataset as plain object frames versus the compact frames the analyzer loads"""
+    raw_dir = raw_dir or RAW_DATA_DIR
+    report = {}
+    for dataset in RAW_DATASETS:
+        filepath = f"{raw_dir}/{dataset}.json"
+        if not os.path.exists(filepath):
+            continue
+        with open(filepath, 'r') as f:
+            records = json.load(f)
+
+        before = int(pd.DataFrame(records).memory_usage(deep=True).sum())
+        compact = compact_frame(records, dataset)
+        after = int(compact.memory_usage(deep=True).sum())
+
+        report[dataset] = {
+            'rows': len(compact),
+            'bytes_before': before,
+            'bytes_after': after,
+            'reduction_percent': round((1 - after / before) * 100, 1) if before else 0.0,
+            'dtypes': {col: str(dtype) for col, dtype in compact.dtypes.items()}
+        }
+
+    report['total'] = {
+        'bytes_before': sum(r['bytes_before'] for r in report.values()),
+        'bytes_after': sum(r['bytes_after'] for r in report.values())
+    }
+    return report
+
+
+if __name__ == '__main__':
+    report = memory_report()
+    total = report.pop('total')
+    print(f"{'dataset':<18}{'rows':>8}{'before':>12}{'after':>12}{'saved':>8}")
+    for dataset, stats in report.items():
+        print(f"{dataset:<18}{stats['rows']:>8}{stats['bytes_before']:>12}{stats['bytes_after']:>12}"
+              f"{stats['reduction_percent']:>7}%")
+    print(f"{'total':<18}{'':>8}{total['bytes_before']:>12}{total['bytes_after']:>12}")
@@ -0,0 +1,199 @@
+import sqlite3
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Fields that identify a record within each raw dataset
+RAW_KEY_FIELDS = {
+    'market_size': ['year'],
+    'pricing': ['service'],
+    'competitors': ['name'],
+    'regional': ['region'],
+    'service_demand': ['date', 'service_type'],
+    'industry_trends': ['trend']
+}
+
+# Processed artifacts are dicts; each top-level section is stored as one record
+PROCESSED_DATASETS = [
+    'growth_analysis', 'forecasts', 'pricing_analysis', 'competitive_analysis',
+    'regional_analysis', 'demand_forecasts', 'trend_significance'
+]
+
+HISTORY_DATASETS = list(RAW_KEY_FIELDS) + PROCESSED_DATASETS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generations_created_at ON generations (created_at);
+
+CREATE TABLE IF NOT EXISTS dataset_keys (
+    dataset TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (dataset, key)
+);
+
+CREATE TABLE IF NOT EXISTS records (
+    dataset TEXT NOT NULL,
+    key TEXT NOT NULL,
+    generation INTEGER NOT NULL REFERENCES generations (id),
+    kind TEXT NOT NULL,
+    payload TEXT,
+    PRIMARY KEY (dataset, key, generation)
+);
+CREATE INDEX IF NOT EXISTS idx_records_generation ON records (generation, dataset);
+"""
+
+
+def to_utc(timestamp):
+    """Aware UTC datetime from a datetime or ISO string; naive values are local time"""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return timestamp.astimezone(timezone.utc)
+
+
+class HistoryStore:
+    """Append-only SQLite archive of every data generation
+
+    Each refresh becomes a generation. Only records whose content changed
+    since the previous generation are written (removed keys get a NULL
+    tombstone), so an ``as_of`` read resolves each key with one seek on the
+    (dataset, key, generation) primary key and stays fast as history grows.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(os.path.dirname(__file__), '../../data/history.db')
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection committed and closed per call, which keeps the store safe across threads"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _record_key(dataset, record):
+        """Stable key of a raw record from its identifying fields"""
+        return '|'.join(str(record.get(field)) for field in RAW_KEY_FIELDS[dataset])
+
+    def _split_records(self, dataset, kind, data):
+        """Break a dataset into {key: payload JSON}"""
+        if kind == 'raw' and isinstance(data, list):
+            return {self._record_key(dataset, record): json.dumps(record, sort_keys=True) for record in data}
+        return {key: json.dumps(value, sort_keys=True) for key, value in data.items()}
+
+    def _load_files(self, raw_dir, processed_dir):
+        """Read every known dataset that exists on disk as (dataset, kind, data)"""
+        sources = [(name, 'raw', f"{raw_dir}/{name}.json") for name in RAW_KEY_FIELDS]
+        sources += [(name, 'processed', f"{processed_dir}/{name}.json") for name in PROCESSED_DATASETS]
+        for dataset, kind, filepath in sources:
+            if os.path.exists(filepath):
+                with open(filepath, 'r') as f:
+                    yield dataset, kind, json.load(f)
+
+    def record_generation(self, raw_dir, processed_dir, created_at=None):
+        """Archive the current raw and processed files as a new generation"""
+        created_at = to_utc(created_at or datetime.now(timezone.utc)).isoformat(timespec='seconds')
+        with self._connect() as conn:
+            generation = conn.execute('INSERT INTO generations (created_at) VALUES (?)', (created_at,)).lastrowid
+
+            for dataset, kind, data in self._load_files(raw_dir, processed_dir):
+                current = self._read_as_of(conn, dataset, generation - 1)
+                incoming = self._split_records(dataset, kind, data)
+
+                rows = [(dataset, key, generation, kind, payload)
+                        for key, payload in incoming.items() if current.get(key) != payload]
+                rows += [(dataset, key, generation, kind, None) for key in current if key not in incoming]
+
+                conn.executemany('INSERT OR IGNORE INTO dataset_keys (dataset, key) VALUES (?, ?)',
+                                 [(dataset, key) for key in incoming])
+                conn.executemany('INSERT INTO records (dataset, key, generation, kind, payload) '
+                                 'VALUES (?, ?, ?, ?, ?)', rows)
+
+        return generation
+
+    def generations(self, limit=None):
+        """Generations newest first as {'generation', 'created_at'} dicts"""
+        query = 'SELECT id, created_at FROM generations ORDER BY id DESC'
+        params = ()
+        if limit:
+            query += ' LIMIT ?'
+            params = (int(limit),)
+        with self._connect() as conn:
+            return [{'generation': row[0], 'created_at': row[1]} for row in conn.execute(query, params)]
+
+    def resolve_generation(self, as_of=None):
+        """Generation id for an id, an ISO timestamp (latest at or before it) or None for latest"""
+        with self._connect() as conn:
+            if as_of is None or as_of == '':
+                row = conn.execute('SELECT MAX(id) FROM generations').fetchone()
+            elif str(as_of).isdigit():
+                row = conn.execute('SELECT id FROM generations WHERE id = ?', (int(as_of),)).fetchone()
+            else:
+                # Older generations stored naive local times, so compare in UTC rather than as strings
+                timestamp = to_utc(str(as_of))
+                rows = conn.execute('SELECT id, created_at FROM generations ORDER BY id DESC')
+                row = next((row for row in rows if to_utc(row[1]) <= timestamp), None)
+        return row[0] if row else None
+
+    def _read_as_of(self, conn, dataset, generation):
+        """{key: payload JSON} of a dataset as it stood at ``generation``"""
+        rows = conn.execute(
+            '''
+            SELECT k.key, (
+                SELECT r.payload FROM records r
+                WHERE r.dataset = k.dataset AND r.key = k.key AND r.generation <= ?
+                ORDER BY r.generation DESC LIMIT 1
+            ) AS payload
+            FROM dataset_keys k
+            WHERE k.dataset = ?
+            ''',
+            (generation, dataset)
+        )
+        return {key: payload for key, payload in rows if payload is not None}
+
+    def read(self, dataset, as_of=None):
+        """Dataset contents at a generation: a record list for raw data, a dict for analyses"""
+        generation = self.resolve_generation(as_of)
+        if generation is None:
+            return None, []
+
+        with self._connect() as conn:
+            records = self._read_as_of(conn, dataset, generation)
+        decoded = {key: json.loads(payload) for key, payload in records.items()}
+        if dataset in RAW_KEY_FIELDS:
+            return generation, [decoded[key] for key in sorted(decoded)]
+        return generation, decoded
+
+    def diff(self, dataset, from_generation, to_generation):
+        """Records added, removed and changed in a dataset between two generations"""
+        start = self.resolve_generation(from_generation)
+        end = self.resolve_generation(to_generation)
+        if start is None or end is None:
+            raise ValueError("Unknown generation")
+
+        with self._connect() as conn:
+            before = self._read_as_of(conn, dataset, start)
+            after = self._read_as_of(conn, dataset, end)
+
+        return {
+            'dataset': dataset,
+            'from_generation': start,
+            'to_generation': end,
+            'added': {key: json.loads(after[key]) for key in sorted(after.keys() - before.keys())},
+            'removed': {key: json.loads(before[key]) for key in sorted(before.keys() - after.keys())},
+            'changed': {
+                key: {'before': json.loads(before[key]), 'after': json.loads(after[key])}
+                for key in sorted(before.keys() & after.keys()) if before[key] != after[key]
+            }
+        }
@@ -0,0 +1,122 @@
+import mmap
+import os
+import shutil
+import threading
+import time
+
+from utils.serialization import dump_file, load_file
+
+CURRENT_POINTER = 'CURRENT'
+RESPONSES_FILE = 'responses.bin'
+MANIFEST_FILE = 'manifest.json'
+
+
+class _Generation:
+    """One published generation, mapped read-only into this process"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.manifest = load_file(os.path.join(path, MANIFEST_FILE))
+
+        with open(os.path.join(path, RESPONSES_FILE), 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._view = memoryview(self._buffer)
+
+    def response(self, name):
+        """Zero-copy view of a pre-serialized response, or None"""
+        entry = self.manifest['responses'].get(name)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._view[offset:offset + length]
+
+
+class SharedArtifactStore:
+    """Read-only artifacts published once per data generation and shared by all workers
+
+    ``publish`` writes pre-serialized response bodies into one flat file
+    inside a fresh generation directory, then atomically swaps the
+    ``CURRENT`` pointer with ``os.replace``. Each worker memory-maps the current generation, so the page cache holds a
+    single copy regardless of worker count. Requests already holding a
+    generation keep reading it after a switch; older directories are pruned
+    only after ``keep_generations`` newer ones exist.
+    """
+
+    def __init__(self, root=None, keep_generations=3, check_interval=1.0):
+        self.root = root or os.path.join(os.path.dirname(__file__), '../../data/shared')
+        self.keep_generations = keep_generations
+        self.check_interval = check_interval
+        os.makedirs(self.root, exist_ok=True)
+        self._generation = None
+        self._generation_name = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def publish(self, responses):
+        """Publish a new generation from a mapping of names to encoded bytes; returns its name"""
+        name = f"gen-{time.time_ns()}-{os.getpid()}"
+        staging = os.path.join(self.root, f".staging-{name}")
+        os.makedirs(staging)
+
+        manifest = {'generation': name, 'responses': {}}
+        offset = 0
+        with open(os.path.join(staging, RESPONSES_FILE), 'wb') as f:
+            for response_name, body in responses.items():
+                f.write(body)
+                manifest['responses'][response_name] = [offset, len(body)]
+                offset += len(body)
+
+        dump_file(manifest, os.path.join(staging, MANIFEST_FILE))
+        os.rename(staging, os.path.join(self.root, name))
+
+        # The pointer swap is the commit point: readers see either the old or the new generation
+        pointer_tmp = os.path.join(self.root, f".{CURRENT_POINTER}.{name}")
+        with open(pointer_tmp, 'w') as f:
+            f.write(name)
+        os.replace(pointer_tmp, os.path.join(self.root, CURRENT_POINTER))
+
+        self._prune()
+        self._checked_at = 0.0
+        return name
+
+    def _prune(self):
+        """Remove generations beyond the retention window"""
+        generations = sorted(d for d in os.listdir(self.root) if d.startswith('gen-'))
+        current = self._read_pointer()
+        for name in generations[:-self.keep_generations]:
+            if name != current:
+                # Mapped files stay valid for processes that still hold them (POSIX unlink semantics)
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def _read_pointer(self):
+        """Name of the current generation, or None before the first publish"""
+        try:
+            with open(os.path.join(self.root, CURRENT_POINTER), 'r') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current(self):
+        """The mapped current generation, re-checking the pointer at most every check_interval"""
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < self.check_interval:
+            return self._generation
+
+        with self._lock:
+            self._checked_at = now
+            name = self._read_pointer()
+            if name and name != self._generation_name:
+                try:
+                    self._generation = _Generation(os.path.join(self.root, name))
+                    self._generation_name = name
+                except FileNotFoundError:
+                    # Pruned between reading the pointer and mapping it; keep serving the old one
+                    pass
+            return self._generation
+
+    def response(self, name):
+        """Pre-serialized response bytes from the current generation, or None"""
+        generation = self.current()
+        return generation.response(name) if generation else None
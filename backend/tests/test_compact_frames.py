@@ -0,0 +1,23 @@
+import numpy as np
+
+from storage.compact_frames import compact_frame
+
+
+def test_unique_strings_stay_objects_and_counts_are_narrowed():
+    records = [{'region': f'Region {i}', 'number_of_companies': 1000 + i,
+                'regulatory_complexity': ['Low', 'High'][i % 2]} for i in range(6)]
+    df = compact_frame(records, 'regional')
+
+    assert df['region'].dtype == object
+    assert df['regulatory_complexity'].dtype == 'category'
+    assert df['number_of_companies'].dtype == np.int16
+    assert df['number_of_companies'].tolist() == [r['number_of_companies'] for r in records]
+
+
+def test_revenue_keeps_int64_for_scaling():
+    records = [{'name': 'A', 'revenue_millions': 3620, 'employee_count': 40872},
+               {'name': 'B', 'revenue_millions': 1170, 'employee_count': 11327}]
+    df = compact_frame(records, 'competitors')
+
+    assert df['employee_count'].dtype == np.int32
+    assert (df['revenue_millions'] * 1000000).tolist() == [3620000000, 1170000000]
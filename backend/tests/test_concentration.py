@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from statistical_analysis.concentration import ConcentrationEngine
+
+
+def competitor_frame(periods=6):
+    rng = np.random.default_rng(1)
+    rows = []
+    for market in ['North', 'South']:
+        for period in range(1, periods + 1):
+            shares = rng.dirichlet(np.ones(7)) * 100
+            for i, share in enumerate(shares):
+                rows.append({
+                    'market': market,
+                    'period': period,
+                    'name': f'Company {i}',
+                    'market_share': share,
+                    'revenue_millions': rng.uniform(50, 500),
+                    'employee_count': int(rng.integers(100, 5000))
+                })
+    return pd.DataFrame(rows)
+
+
+def expected_concentration(df):
+    grouped = df.groupby(['market', 'period'])['market_share']
+    return pd.DataFrame({
+        'hhi_index': grouped.apply(lambda s: (s ** 2).sum()),
+        'cr4_ratio': grouped.apply(lambda s: s.nlargest(4).sum()),
+        'number_of_players': grouped.size()
+    })
+
+
+def test_compute_matches_groupby():
+    df = competitor_frame()
+    summary = ConcentrationEngine().compute(df)['summary'].set_index(['market', 'period']).sort_index()
+    expected = expected_concentration(df)
+
+    np.testing.assert_allclose(summary['hhi_index'], expected['hhi_index'])
+    np.testing.assert_allclose(summary['cr4_ratio'], expected['cr4_ratio'])
+    np.testing.assert_array_equal(summary['number_of_players'], expected['number_of_players'])
+
+
+def test_leaders_are_top_shares_per_group():
+    df = competitor_frame()
+    leaders = ConcentrationEngine(top_n=3).compute(df)['leaders']
+
+    for (market, period), group in df.groupby(['market', 'period']):
+        ranked = leaders[(leaders['market'] == market) & (leaders['period'] == period)].sort_values('rank')
+        assert ranked['name'].tolist() == group.nlargest(3, 'market_share')['name'].tolist()
+        assert ranked['rank'].tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize('window', [2, 3])
+def test_rolling_windows_end_at_each_period(window):
+    df = competitor_frame()
+    summary = ConcentrationEngine().rolling(df, window)['summary'].set_index(['market', 'period']).sort_index()
+
+    # The first window-1 periods have no complete window
+    assert sorted(summary.index.get_level_values('period').unique()) == list(range(window, 7))
+
+    for (market, period), row in summary.iterrows():
+        in_window = df[(df['market'] == market) & df['period'].between(period - window + 1, period)]
+        averaged = in_window.groupby('name')['market_share'].mean()
+        assert row['hhi_index'] == pytest.approx((averaged ** 2).sum())
+        assert row['cr4_ratio'] == pytest.approx(averaged.nlargest(4).sum())
+
+
+def test_cached_periods_are_not_recomputed(monkeypatch):
+    df = competitor_frame()
+    engine = ConcentrationEngine()
+    computed = []
+    compute_groups = engine._compute_groups
+
+    def spy(frame):
+        computed.append(sorted(frame['period'].unique().tolist()))
+        return compute_groups(frame)
+
+    monkeypatch.setattr(engine, '_compute_groups', spy)
+
+    first = engine.compute(df[df['period'] <= 5])
+    second = engine.compute(df)
+    assert computed == [[1, 2, 3, 4, 5], [6]]
+    pd.testing.assert_frame_equal(second['summary'].iloc[:len(first['summary'])], first['summary'])
+
+    # A revised period is recomputed; an unchanged call computes nothing
+    revised = df.assign(market_share=np.where(df['period'] == 3, df['market_share'] * 1.01, df['market_share']))
+    engine.compute(revised)
+    engine.compute(revised)
+    assert computed == [[1, 2, 3, 4, 5], [6], [3]]
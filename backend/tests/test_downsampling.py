@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask
+
+from api import routes
+from statistical_analysis.downsampling import downsample_records, lttb_indices, minmax_indices, min_points
+from storage.shared_artifacts import SharedArtifactStore
+from utils.serialization import dumps
+
+
+def series(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 50) + rng.normal(0, 0.05, n)
+    return x, y
+
+
+@pytest.mark.parametrize('select', [lttb_indices, minmax_indices])
+@pytest.mark.parametrize('max_points', [4, 10, 99, 500])
+def test_endpoints_kept_within_budget(select, max_points):
+    x, y = series()
+    indices = select(x, y, max_points)
+
+    assert len(indices) <= max_points
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_short_series_are_returned_whole():
+    x, y = series(n=20)
+    np.testing.assert_array_equal(lttb_indices(x, y, 50), np.arange(20))
+    np.testing.assert_array_equal(minmax_indices(x, y, 50), np.arange(20))
+
+
+@pytest.mark.parametrize('select', [lttb_indices, minmax_indices])
+def test_spikes_are_preserved(select):
+    x, y = series()
+    y[337] += 10
+    y[712] -= 10
+    indices = select(x, y, 50)
+
+    assert 337 in indices and 712 in indices
+
+
+@pytest.mark.parametrize('n_cols', [1, 3, 4])
+def test_minmax_respects_smallest_budget(n_cols):
+    x, y = series()
+    ys = np.column_stack([y * (col + 1) for col in range(n_cols)])
+    budget = min_points('minmax', n_cols)
+
+    assert len(minmax_indices(x, ys, budget)) <= budget
+    with pytest.raises(ValueError):
+        minmax_indices(x, ys, budget - 1)
+
+
+def service_records():
+    rng = np.random.default_rng(1)
+    dates = pd.date_range('2015-01-01', periods=300, freq='D').strftime('%Y-%m-%d')
+    records = [{'date': date, 'service_type': service, 'demand_score': float(rng.uniform(70, 95)),
+                'avg_ticket_value': float(rng.uniform(100, 400)), 'volume': int(rng.integers(100, 1000))}
+               for date in dates for service in ['Inspections', 'Cleaning', 'Repairs']]
+    # Shuffle so output order cannot follow from sorting by date
+    return [records[i] for i in rng.permutation(len(records))]
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_groups_are_downsampled_separately_in_input_order(method):
+    records = service_records()
+    sampled = downsample_records(records, 'date', ['demand_score', 'volume'], 40, method=method, group='service_type')
+
+    positions = [records.index(record) for record in sampled]
+    assert positions == sorted(positions)
+
+    df = pd.DataFrame(records)
+    kept = pd.DataFrame(sampled)
+    for service, group in df.groupby('service_type'):
+        kept_dates = kept.loc[kept['service_type'] == service, 'date']
+        assert 0 < len(kept_dates) <= 40
+        assert {group['date'].min(), group['date'].max()} <= set(kept_dates)
+
+
+def test_minmax_below_budget_is_rejected_by_route(tmp_path, monkeypatch):
+    store = SharedArtifactStore(str(tmp_path / 'shared'))
+    monkeypatch.setattr(routes, 'shared_store', store)
+    store.publish({'services': dumps({'service_data': service_records(), 'status': 'success'})})
+    app = Flask(__name__)
+    app.register_blueprint(routes.api_bp, url_prefix='/api')
+    client = app.test_client()
+
+    assert client.get('/api/services?max_points=3&method=minmax').status_code == 400
+    response = client.get('/api/services?max_points=8&method=minmax')
+    assert response.status_code == 200
+    # Three service types, each within its own budget
+    assert response.json['downsampling']['points'] <= 8 * 3
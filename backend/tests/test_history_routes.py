@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+
+from api import routes
+from storage.history_store import HistoryStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / 'history.sqlite'))
+    raw, processed = tmp_path / 'raw', tmp_path / 'processed'
+    raw.mkdir()
+    processed.mkdir()
+    (raw / 'pricing.json').write_text('[{"service": "Roofing", "avg_hourly_rate": 120.0}]')
+    store.record_generation(str(raw), str(processed))
+    monkeypatch.setattr(routes, 'history_store', store)
+
+    app = Flask(__name__)
+    app.register_blueprint(routes.api_bp, url_prefix='/api')
+    return app.test_client()
+
+
+def test_read_and_diff_known_dataset(client):
+    assert client.get('/api/history/pricing').json['data'] == [{'service': 'Roofing', 'avg_hourly_rate': 120.0}]
+    assert client.get('/api/history/pricing/diff?from=1&to=1').status_code == 200
+
+
+@pytest.mark.parametrize('path', ['/api/history/nosuch', '/api/history/nosuch/diff?from=1&to=1'])
+def test_unknown_dataset_is_404(client, path):
+    assert client.get(path).status_code == 404
+
+
+@pytest.mark.parametrize('limit', ['abc', '0', '-1'])
+def test_invalid_limit_is_400(client, limit):
+    assert client.get(f'/api/history/generations?limit={limit}').status_code == 400
+    assert client.get('/api/history/generations?limit=1').status_code == 200
+
+
+def test_timezone_aware_as_of_is_compared_in_utc(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.sqlite'))
+    raw, processed = tmp_path / 'raw', tmp_path / 'processed'
+    raw.mkdir()
+    processed.mkdir()
+    # A legacy naive local timestamp, then an aware one 30 minutes later
+    local_noon = datetime(2026, 1, 1, 12, 0, 0)
+    store.record_generation(str(raw), str(processed), created_at=local_noon)
+    second = local_noon.astimezone(timezone.utc) + timedelta(minutes=30)
+    store.record_generation(str(raw), str(processed), created_at=second)
+
+    assert store.resolve_generation(second.strftime('%Y-%m-%dT%H:%M:%SZ')) == 2
+    assert store.resolve_generation((second - timedelta(minutes=1)).strftime('%Y-%m-%dT%H:%M:%SZ')) == 1
+    plus_five = (second - timedelta(minutes=1)).astimezone(timezone(timedelta(hours=5)))
+    assert store.resolve_generation(plus_five.isoformat()) == 1
+    assert store.resolve_generation(plus_five.isoformat().replace('T', ' ')) == 1
+    assert store.resolve_generation(local_noon.isoformat()) == 1
+    assert store.resolve_generation((local_noon - timedelta(seconds=1)).isoformat()) is None
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+from statsmodels.stats.multitest import multipletests
+
+from statistical_analysis.hypothesis_testing import TrendHypothesisTester, adjust_pvalues, CORRECTION_METHODS
+
+
+def per_row_reference(df, sample_size=100, sample_std=15):
+    """The original row-by-row t-test from trend_significance_testing"""
+    industry_avg = df['adoption_rate'].mean()
+    rows = []
+    for _, row in df.iterrows():
+        t_statistic = (row['adoption_rate'] - industry_avg) / (sample_std / np.sqrt(sample_size))
+        p_value = 2 * (1 - stats.t.cdf(abs(t_statistic), sample_size - 1))
+        cohens_d = (row['adoption_rate'] - industry_avg) / sample_std
+        rows.append({
+            'p_value': p_value,
+            'significantly_different': p_value < 0.05,
+            'effect_size': cohens_d,
+            'interpretation': 'Large' if abs(cohens_d) > 0.8 else 'Medium' if abs(cohens_d) > 0.5 else 'Small',
+            'investment_roi_potential': row['growth_potential'] * row['impact_score'] / 10
+        })
+    return pd.DataFrame(rows, index=df.index)
+
+
+def trends_frame(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'adoption_rate': np.r_[rng.uniform(20, 90, n - 2), 5.0, 99.0],
+        'growth_potential': rng.uniform(3, 15, n),
+        'impact_score': rng.uniform(5, 10, n)
+    })
+
+
+def test_matches_per_row_formula():
+    df = trends_frame()
+    expected = per_row_reference(df)
+    results = TrendHypothesisTester(sample_size=100, sample_std=15).run(df)
+
+    assert (results['significantly_different'] == expected['significantly_different']).all()
+    assert (results['interpretation'] == expected['interpretation']).all()
+    np.testing.assert_allclose(results['effect_size'], expected['effect_size'], rtol=1e-12)
+    np.testing.assert_allclose(results['investment_roi_potential'], expected['investment_roi_potential'], rtol=1e-12)
+    # sf and 1 - cdf agree except in the far tail, where 1 - cdf rounds to 0
+    np.testing.assert_allclose(results['p_value'], expected['p_value'], rtol=0, atol=1e-15)
+    assert (results['p_value'] > 0).all()
+
+
+def test_adjust_pvalues_against_statsmodels():
+    p = np.random.default_rng(1).uniform(0, 0.1, 50)
+    for method in ('fdr_bh', 'holm'):
+        np.testing.assert_allclose(adjust_pvalues(p, method), multipletests(p, method=method)[1])
+
+
+def test_every_labelled_correction_is_supported():
+    p = np.random.default_rng(2).uniform(0, 0.1, 10)
+    for method in CORRECTION_METHODS:
+        assert adjust_pvalues(p, method).shape == p.shape
+    np.testing.assert_array_equal(adjust_pvalues(p, 'none'), p)
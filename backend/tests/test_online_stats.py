@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from statistical_analysis.online_stats import CorrelationAccumulator
+from statistical_analysis.analyzer import StatisticalAnalyzer
+from utils.serialization import dump_file, load_file
+
+COLUMNS = ['a', 'b', 'c']
+
+
+def sample_frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=n)
+    return pd.DataFrame({'a': base, 'b': 2 * base + rng.normal(size=n), 'c': rng.normal(10, 3, n)})
+
+
+def test_update_matches_pandas():
+    df = sample_frame()
+    acc = CorrelationAccumulator(COLUMNS)
+    for row in df.to_dict('records'):
+        acc.update(row)
+
+    np.testing.assert_allclose(acc.covariance(), df.cov().to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(acc.correlation(), df.corr().to_numpy(), rtol=1e-12)
+
+
+def test_merged_chunks_match_pandas():
+    df = sample_frame()
+    chunks = [CorrelationAccumulator(COLUMNS).update_batch(chunk) for chunk in (df.iloc[i:i + 70] for i in range(0, len(df), 70))]
+    merged = chunks[0]
+    for chunk in chunks[1:]:
+        merged.merge(chunk)
+
+    assert merged.count == len(df)
+    np.testing.assert_allclose(merged.covariance(), df.cov().to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(merged.correlation(), df.corr().to_numpy(), rtol=1e-12)
+
+
+def test_rows_with_nan_are_skipped():
+    df = sample_frame(100)
+    with_gaps = df.copy()
+    with_gaps.loc[[3, 40, 77], 'b'] = np.nan
+
+    batch = CorrelationAccumulator(COLUMNS).update_batch(with_gaps)
+    single = CorrelationAccumulator(COLUMNS)
+    for row in with_gaps.to_dict('records'):
+        single.update(row)
+
+    complete = with_gaps.dropna()
+    for acc in (batch, single):
+        assert acc.count == len(complete)
+        np.testing.assert_allclose(acc.correlation(), complete.corr().to_numpy(), rtol=1e-12)
+
+
+def test_round_trip_through_state_file(tmp_path):
+    acc = CorrelationAccumulator(COLUMNS).update_batch(sample_frame())
+    acc.save(str(tmp_path / 'state.json'))
+    loaded = CorrelationAccumulator.load(str(tmp_path / 'state.json'), COLUMNS)
+    np.testing.assert_array_equal(loaded.comoment, acc.comoment)
+    assert CorrelationAccumulator.load(str(tmp_path / 'missing.json'), COLUMNS).count == 0
+
+
+def test_ingest_without_state_starts_from_snapshot(tmp_path):
+    analyzer = StatisticalAnalyzer(raw_data_dir=str(tmp_path), processed_data_dir=str(tmp_path))
+
+    rng = np.random.default_rng(2)
+    snapshot = pd.DataFrame(rng.uniform(1, 100, (8, len(analyzer.REGIONAL_NUMERIC_COLS))),
+                            columns=analyzer.REGIONAL_NUMERIC_COLS)
+    snapshot['region'] = [f'Region {i}' for i in range(len(snapshot))]
+    dump_file(snapshot.to_dict('records'), str(tmp_path / 'regional.json'))
+
+    observation = {col: 50.0 for col in analyzer.REGIONAL_NUMERIC_COLS}
+    result = analyzer.ingest_regional_observations([observation])
+
+    expected = pd.concat([snapshot, pd.DataFrame([observation])])[analyzer.REGIONAL_NUMERIC_COLS].corr()
+    assert result['correlation_observations'] == len(snapshot) + 1
+    written = load_file(str(tmp_path / 'regional_analysis.json'))['correlation_matrix']
+    np.testing.assert_allclose(pd.DataFrame(written).loc[expected.index, expected.columns].to_numpy(),
+                               expected.to_numpy(), rtol=1e-12)
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from data_collection.refresh_scheduler import PriorityGate, ProcessLock, RefreshJob, RefreshScheduler
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def start(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_gate_admits_waiters_in_priority_order():
+    gate = PriorityGate(1)
+    gate.acquire(0)
+    admitted = []
+
+    def run(priority):
+        gate.acquire(priority)
+        admitted.append(priority)
+        gate.release()
+
+    threads = [start(run, priority) for priority in (5, 1, 3)]
+    wait_until(lambda: len(gate._waiting) == 3)
+    gate.release()
+    for thread in threads:
+        thread.join(2)
+
+    assert admitted == [1, 3, 5]
+
+
+def test_exclusive_holder_takes_every_slot():
+    gate = PriorityGate(2)
+    gate.acquire(5)
+    exclusive = threading.Event()
+
+    def run_exclusive():
+        gate.acquire(0, exclusive=True)
+        exclusive.set()
+
+    start(run_exclusive)
+    wait_until(lambda: len(gate._waiting) == 1)
+    # One slot is free, but an exclusive run needs both
+    assert not exclusive.wait(0.05)
+    gate.release()
+    assert exclusive.wait(2)
+
+    shared = threading.Event()
+    start(lambda: (gate.acquire(5), shared.set()))
+    assert not shared.wait(0.05)
+    gate.release(exclusive=True)
+    assert shared.wait(2)
+
+
+def test_file_lock_is_shared_between_jobs_and_exclusive_for_full_refreshes(tmp_path):
+    path = str(tmp_path / 'refresh.lock')
+    shared_lock, other_shared, exclusive_lock = ProcessLock(path), ProcessLock(path), ProcessLock(path)
+    exclusive = threading.Event()
+
+    def hold_exclusive():
+        with exclusive_lock.hold():
+            exclusive.set()
+
+    with shared_lock.hold(shared=True):
+        # A second shared holder does not block
+        with other_shared.hold(shared=True):
+            pass
+        start(hold_exclusive)
+        assert not exclusive.wait(0.1)
+    assert exclusive.wait(2)
+
+
+def test_failed_job_is_reported_without_publishing(tmp_path):
+    published = []
+    scheduler = RefreshScheduler(on_complete=[published.append], lock_dir=str(tmp_path))
+    attempts = []
+
+    def collect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("source unavailable")
+
+    scheduler.jobs['pricing'] = RefreshJob('pricing', collect, [], {'hours': 1})
+
+    assert scheduler.run_job('pricing') is False
+    status = scheduler.status()[0]
+    assert status['last_error'] == "source unavailable"
+    assert status['run_count'] == 1 and status['last_run'] is not None
+    assert published == []
+
+    assert scheduler.run_job('pricing') is True
+    assert scheduler.status()[0]['last_error'] is None
+    assert published == ['pricing']
+
+    def fail():
+        raise RuntimeError("disk full")
+
+    assert scheduler.run_exclusive('all datasets', fail) is False
+    assert published == ['pricing']
+
+
+def test_only_one_scheduler_runs_the_schedule(tmp_path, capsys):
+    leader = RefreshScheduler(lock_dir=str(tmp_path))
+    follower = RefreshScheduler(lock_dir=str(tmp_path))
+    try:
+        assert leader.start() is True
+        assert follower.start() is False
+        assert follower.running is False
+        assert "run by another process" in capsys.readouterr().out
+    finally:
+        leader.shutdown()
+        follower.shutdown()
+
+
+def test_unknown_missed_run_policy_is_rejected():
+    with pytest.raises(ValueError):
+        RefreshScheduler().register(RefreshJob('pricing', lambda: None, [], {'hours': 1}, missed_run_policy='later'))
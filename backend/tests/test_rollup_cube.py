@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from statistical_analysis.rollup_cube import RollupCube
+
+
+def service_frame():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2023-01-31', periods=24, freq='M')
+    df = pd.DataFrame({
+        'date': np.repeat(dates, 2),
+        'service_type': ['Inspections', 'Cleaning Services'] * 24,
+        'demand_score': rng.uniform(70, 95, 48),
+        'volume': rng.integers(100, 1000, 48)
+    })
+    return df
+
+
+@pytest.fixture
+def cube():
+    return RollupCube.build(service_frame())
+
+
+def test_query_matches_groupby(cube):
+    df = service_frame()
+    inspections = df[df['service_type'] == 'Inspections']
+    expected = inspections.groupby(inspections['date'].dt.year)['volume'].sum()
+
+    rows = cube.query(by=['year'], measures=['volume'], stats=['sum'], service_type='Inspections')
+    assert {r['year']: r['volume']['sum'] for r in rows} == {str(y): float(v) for y, v in expected.items()}
+
+
+@pytest.mark.parametrize('kwargs', [{'stats': ['median']}, {'measures': ['revenue']}, {'by': ['region']}])
+def test_unknown_names_raise_value_error(cube, kwargs):
+    with pytest.raises(ValueError):
+        cube.query(**kwargs)
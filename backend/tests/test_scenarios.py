@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from statistical_analysis.scenarios import ScenarioEngine, MAX_SIMULATED_VALUES
+from utils.serialization import dump_file
+
+
+@pytest.fixture
+def engine(tmp_path):
+    raw = tmp_path / 'raw'
+    raw.mkdir()
+    dump_file([{'year': 2024, 'market_size_billions': 500.0}, {'year': 2025, 'market_size_billions': 530.0}],
+              str(raw / 'market_size.json'))
+    dump_file([{'region': 'North America', 'market_size_billions': 300.0},
+               {'region': 'Europe', 'market_size_billions': 230.0}], str(raw / 'regional.json'))
+    return ScenarioEngine(str(raw), str(tmp_path / 'cache'), memory_cache_size=2, disk_cache_size=3)
+
+
+@pytest.mark.parametrize('overrides', [
+    {'growth_mean': 'nan'}, {'growth_mean': '1e308'}, {'shock_mean': 'inf'}, {'seed': -1}, {'unknown': 1},
+    {'growth_mean': [1]}, {'growth_mean': None}, {'n_paths': 'many'}, {'n_paths': {}}, {'seed': True}
+])
+def test_invalid_parameters_raise_value_error(engine, overrides):
+    with pytest.raises(ValueError):
+        engine.simulate(overrides)
+
+
+def test_oversized_runs_are_rejected(engine):
+    # 2 regions x 3 segments -> 1 + 3 + 2 + 6 views per path-year
+    horizon = 30
+    n_paths = MAX_SIMULATED_VALUES // (12 * horizon) + 1
+    with pytest.raises(ValueError):
+        engine.simulate({'n_paths': n_paths, 'horizon_years': horizon})
+
+
+def test_caches_are_bounded(engine):
+    for seed in range(6):
+        engine.simulate({'n_paths': 200, 'seed': seed})
+
+    assert len(os.listdir(engine.cache_dir)) == 3
+    assert len(engine._memory_cache) == 2
+
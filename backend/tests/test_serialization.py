@@ -0,0 +1,39 @@
+import math
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from utils import serialization
+from utils.serialization import dumps, loads
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(serialization, 'orjson', None)
+    elif serialization.orjson is None:
+        pytest.skip('orjson not installed')
+    return request.param
+
+
+def test_round_trip_from_memoryview(encoder):
+    payload = {'values': [1, 2.5, None], 'name': 'Roofing'}
+    assert loads(memoryview(dumps(payload))) == payload
+
+
+def test_numpy_and_non_finite_values(encoder):
+    encoded = loads(dumps({'n': np.int64(3), 'x': np.float64(math.nan), 'a': np.arange(3)}))
+    assert encoded == {'n': 3, 'x': None, 'a': [0, 1, 2]}
+
+
+def test_dump_file_uses_regular_file_permissions(tmp_path):
+    new_file = tmp_path / 'artifact.json'
+    serialization.dump_file({'a': 1}, str(new_file))
+    assert stat.S_IMODE(new_file.stat().st_mode) == 0o666 & ~serialization._UMASK
+
+    os.chmod(new_file, 0o640)
+    serialization.dump_file({'a': 2}, str(new_file))
+    assert stat.S_IMODE(new_file.stat().st_mode) == 0o640
+    assert serialization.load_file(str(new_file)) == {'a': 2}
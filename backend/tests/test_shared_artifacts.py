@@ -0,0 +1,44 @@
+import pytest
+from flask import Flask
+from werkzeug.test import EnvironBuilder
+
+from api import routes
+from storage.shared_artifacts import SharedArtifactStore
+from utils.serialization import dumps, loads
+
+
+def strict_wsgi_get(app, path):
+    """Run a request the way gunicorn does: every body chunk must be bytes"""
+    status_headers = {}
+
+    def start_response(status, headers, exc_info=None):
+        status_headers['status'] = status
+        status_headers['headers'] = dict(headers)
+
+    environ = EnvironBuilder(path=path).get_environ()
+    body = b''
+    for chunk in app.wsgi_app(environ, start_response):
+        if not isinstance(chunk, bytes):
+            raise TypeError(f"{chunk!r} is not a byte")
+        body += chunk
+    return status_headers['status'], status_headers['headers'], body
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    store = SharedArtifactStore(str(tmp_path / 'shared'))
+    monkeypatch.setattr(routes, 'shared_store', store)
+    store.publish({'pricing': dumps({'pricing_data': [{'service': 'Roofing'}], 'status': 'success'})})
+
+    app = Flask(__name__)
+    app.register_blueprint(routes.api_bp, url_prefix='/api')
+    return app
+
+
+def test_published_artifact_body_is_bytes(app):
+    status, headers, body = strict_wsgi_get(app, '/api/pricing')
+
+    assert status.startswith('200')
+    assert int(headers['Content-Length']) == len(body)
+    assert loads(body)['pricing_data'] == [{'service': 'Roofing'}]
+    assert headers['X-Data-Generation'] == routes.get_shared_store().current().name
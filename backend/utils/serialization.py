@@ -0,0 +1,156 @@
+import json
+import math
+import os
+import stat
+import tempfile
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+JSON_MIMETYPE = 'application/json'
+
+# Process umask, read once at import while still single-threaded; os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _default(obj):
+    """Convert values the fast encoder does not handle natively"""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.datetime64):
+        return None if np.isnat(obj) else str(obj)
+    if isinstance(obj, np.ndarray):
+        # orjson only serializes contiguous arrays of native types; fall back to lists
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('records')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _to_builtin(obj):
+    """Recursively convert to stdlib-encodable values, mapping NaN/inf to None"""
+    if isinstance(obj, dict):
+        return {k if isinstance(k, (str, int, float, bool)) or k is None else str(_to_builtin(k)): _to_builtin(v)
+                for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_builtin(v) for v in obj]
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, (str, int, bool)) or obj is None:
+        return obj
+    return _to_builtin(_default(obj))
+
+
+def dumps(obj, indent=False):
+    """Serialize to UTF-8 JSON bytes, compact unless ``indent`` is set
+
+    numpy scalars and arrays, pandas Timestamps and NaT are encoded
+    natively; NaN and infinity become ``null`` so the output is always valid
+    JSON for browsers.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # e.g. numpy scalar dict keys, which orjson rejects; normalize and retry
+            return orjson.dumps(_to_builtin(obj), option=option)
+
+    return json.dumps(_to_builtin(obj), indent=2 if indent else None,
+                      separators=None if indent else (',', ':'), allow_nan=False).encode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from bytes, a memoryview (e.g. a shared artifact) or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dump_file(obj, filepath, indent=False):
+    """Write an artifact atomically so readers never see a half-written file
+
+    The file keeps the mode of the artifact it replaces, or gets the usual
+    ``0o666 & ~umask`` when new, rather than mkstemp's owner-only 0600.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps(obj, indent=indent))
+        try:
+            mode = stat.S_IMODE(os.stat(filepath).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_file(filepath):
+    """Read a JSON artifact"""
+    with open(filepath, 'rb') as f:
+        return loads(f.read())
+
+
+def json_response(obj, status=200):
+    """Flask response carrying pre-encoded JSON"""
+    return Response(dumps(obj), status=status, mimetype=JSON_MIMETYPE)
+
+
+def benchmark(payloads, repeat=20):
+    """Seconds per call for the previous ``json.dumps(indent=2)`` path versus ``dumps``"""
+    import timeit
+
+    results = {}
+    for name, payload in payloads.items():
+        builtin = _to_builtin(payload)
+        before = min(timeit.repeat(lambda: json.dumps(builtin, indent=2), number=1, repeat=repeat))
+        after = min(timeit.repeat(lambda: dumps(payload), number=1, repeat=repeat))
+        results[name] = {
+            'stdlib_indent_seconds': before,
+            'fast_compact_seconds': after,
+            'stdlib_indent_bytes': len(json.dumps(builtin, indent=2).encode('utf-8')),
+            'fast_compact_bytes': len(dumps(payload)),
+            'speedup': before / after if after else float('inf')
+        }
+    return results
+
+
+if __name__ == '__main__':
+    data_dir = os.path.join(os.path.dirname(__file__), '../../data')
+    payloads = {}
+    for sub in ('raw', 'processed'):
+        directory = f"{data_dir}/{sub}"
+        if os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith('.json'):
+                    payloads[f"{sub}/{filename}"] = load_file(f"{directory}/{filename}")
+
+    print(f"encoder: {'orjson' if orjson is not None else 'stdlib json'}")
+    print(f"{'artifact':<44}{'stdlib us':>12}{'fast us':>10}{'speedup':>9}{'bytes':>10}{'compact':>10}")
+    for name, stats in benchmark(payloads).items():
+        print(f"{name:<44}{stats['stdlib_indent_seconds'] * 1e6:>12.1f}{stats['fast_compact_seconds'] * 1e6:>10.1f}"
+              f"{stats['speedup']:>8.1f}x{stats['stdlib_indent_bytes']:>10}{stats['fast_compact_bytes']:>10}")
@@ -13,9 +13,9 @@ function CompetitorAnalysis() {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (options = {}) => {
     try {
-      const response = await competitorAPI.getCompetitors();
+      const response = await competitorAPI.getCompetitors({ ...options, onUpdate: (fresh) => setData(fresh.data) });
       setData(response.data);
     } catch (error) {
       console.error('Error fetching competitor data:', error);
@@ -14,10 +14,10 @@ function Dashboard() {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (options = {}) => {
     try {
       setLoading(true);
-      const response = await dashboardAPI.getSummary();
+      const response = await dashboardAPI.getSummary({ ...options, onUpdate: (fresh) => setData(fresh.data) });
       setData(response.data);
       setError(null);
     } catch (err) {
@@ -69,7 +69,7 @@ function Dashboard() {
     <div className="page-container dashboard">
       <header className="page-header">
         <h1>Property Maintenance Market Dashboard</h1>
-        <button onClick={fetchData} className="refresh-btn">
+        <button onClick={() => fetchData({ force: true })} className="refresh-btn">
           🔄 Refresh Data
         </button>
       </header>
@@ -13,9 +13,9 @@ function IndustryTrends() {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (options = {}) => {
     try {
-      const response = await trendAPI.getTrends();
+      const response = await trendAPI.getTrends({ ...options, onUpdate: (fresh) => setData(fresh.data) });
       setData(response.data);
     } catch (error) {
       console.error('Error fetching trends data:', error);
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, ComposedChart, Area } from 'recharts';
-import { marketAPI } from '../services/api';
+import { marketAPI, CHART_MAX_POINTS } from '../services/api';
 import '../styles/Page.css';
 
 function MarketOverview() {
@@ -11,9 +11,9 @@ function MarketOverview() {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (options = {}) => {
     try {
-      const response = await marketAPI.getOverview();
+      const response = await marketAPI.getOverview({ ...options, params: { max_points: CHART_MAX_POINTS }, onUpdate: (fresh) => setData(fresh.data) });
       setData(response.data);
     } catch (error) {
       console.error('Error fetching market data:', error);
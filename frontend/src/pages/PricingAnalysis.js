@@ -13,9 +13,9 @@ function PricingAnalysis() {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (options = {}) => {
     try {
-      const response = await pricingAPI.getPricing();
+      const response = await pricingAPI.getPricing({ ...options, onUpdate: (fresh) => setData(fresh.data) });
       setData(response.data);
     } catch (error) {
       console.error('Error fetching pricing data:', error);
@@ -13,9 +13,9 @@ function RegionalAnalysis() {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (options = {}) => {
     try {
-      const response = await regionalAPI.getRegional();
+      const response = await regionalAPI.getRegional({ ...options, onUpdate: (fresh) => setData(fresh.data) });
       setData(response.data);
     } catch (error) {
       console.error('Error fetching regional data:', error);
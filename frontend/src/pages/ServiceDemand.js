@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { LineChart, Line, BarChart, Bar, AreaChart, Area, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
-import { serviceAPI } from '../services/api';
+import { serviceAPI, CHART_MAX_POINTS } from '../services/api';
 import '../styles/Page.css';
 
 const SERVICE_COLORS = {
@@ -21,9 +21,9 @@ function ServiceDemand() {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (options = {}) => {
     try {
-      const response = await serviceAPI.getServices();
+      const response = await serviceAPI.getServices({ ...options, params: { max_points: CHART_MAX_POINTS }, onUpdate: (fresh) => setData(fresh.data) });
       setData(response.data);
     } catch (error) {
       console.error('Error fetching service demand data:', error);
@@ -115,6 +115,7 @@ function ServiceDemand() {
                   stroke={SERVICE_COLORS[type] || '#8884d8'}
                   strokeWidth={2}
                   dot={false}
+                  connectNulls
                   name={type}
                 />
               ))}
@@ -31,37 +31,227 @@ api.interceptors.response.use(
   }
 );
 
+// Response cache: in-flight deduplication, memory + IndexedDB persistence and
+// stale-while-revalidate. Entries keep the server ETag so revalidation is a
+// conditional request that usually returns an empty 304.
+const CACHE_DB_NAME = 'market-analysis-cache';
+const CACHE_STORE = 'responses';
+const FRESH_FOR_MS = 30 * 1000;
+
+// Cache bounds: scenario and rollup parameters create a new key per query, so
+// the least recently refreshed entries are evicted beyond MAX_CACHE_ENTRIES
+// and persisted entries expire after MAX_PERSISTED_AGE_MS.
+const MAX_CACHE_ENTRIES = 100;
+const MAX_PERSISTED_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+
+// Points per series requested from time-series endpoints; the server
+// downsamples longer histories with LTTB so charts stay fast to draw.
+export const CHART_MAX_POINTS = 500;
+
+const memoryCache = new Map();
+const inFlight = new Map();
+let cacheDBPromise = null;
+
+const openCacheDB = () => {
+  if (typeof indexedDB === 'undefined') {
+    return Promise.resolve(null);
+  }
+  if (!cacheDBPromise) {
+    cacheDBPromise = new Promise((resolve) => {
+      const request = indexedDB.open(CACHE_DB_NAME, 2);
+      request.onupgradeneeded = () => {
+        const store = request.result.objectStoreNames.contains(CACHE_STORE)
+          ? request.transaction.objectStore(CACHE_STORE)
+          : request.result.createObjectStore(CACHE_STORE, { keyPath: 'key' });
+        if (!store.indexNames.contains('storedAt')) {
+          store.createIndex('storedAt', 'storedAt');
+        }
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => resolve(null);
+    });
+  }
+  return cacheDBPromise;
+};
+
+const withStore = async (mode, operation) => {
+  const db = await openCacheDB();
+  if (!db) {
+    return null;
+  }
+  return new Promise((resolve) => {
+    const request = operation(db.transaction(CACHE_STORE, mode).objectStore(CACHE_STORE));
+    request.onsuccess = () => resolve(request.result || null);
+    request.onerror = () => resolve(null);
+  });
+};
+
+const readPersisted = async (key) => {
+  const entry = await withStore('readonly', (store) => store.get(key));
+  return entry && Date.now() - entry.storedAt <= MAX_PERSISTED_AGE_MS ? entry : null;
+};
+
+// Delete expired entries, then the oldest ones beyond MAX_CACHE_ENTRIES,
+// walking the storedAt index from the oldest entry.
+const prunePersisted = async () => {
+  const db = await openCacheDB();
+  if (!db) {
+    return;
+  }
+  const store = db.transaction(CACHE_STORE, 'readwrite').objectStore(CACHE_STORE);
+  const countRequest = store.count();
+  countRequest.onsuccess = () => {
+    let excess = countRequest.result - MAX_CACHE_ENTRIES;
+    const expiredBefore = Date.now() - MAX_PERSISTED_AGE_MS;
+    store.index('storedAt').openCursor().onsuccess = (event) => {
+      const cursor = event.target.result;
+      if (!cursor || (excess <= 0 && cursor.key >= expiredBefore)) {
+        return;
+      }
+      cursor.delete();
+      excess -= 1;
+      cursor.continue();
+    };
+  };
+};
+
+const persist = (entry) => withStore('readwrite', (store) => store.put(entry)).then(prunePersisted);
+
+// Map iteration follows insertion order, so re-inserting keeps the least
+// recently used entry first.
+const remember = (key, entry) => {
+  memoryCache.delete(key);
+  memoryCache.set(key, entry);
+  if (memoryCache.size > MAX_CACHE_ENTRIES) {
+    memoryCache.delete(memoryCache.keys().next().value);
+  }
+};
+
+const cacheKey = (url, params) => {
+  const query = params ? new URLSearchParams(params).toString() : '';
+  return query ? `${url}?${query}` : url;
+};
+
+const toResponse = (entry, fromCache) => ({
+  data: entry.data,
+  status: 200,
+  headers: { etag: entry.etag, 'x-data-generation': entry.generation },
+  cached: fromCache,
+  storedAt: entry.storedAt,
+});
+
+// Fetch from the network, sharing one request between concurrent callers.
+// Resolves to { response, changed }.
+const revalidate = (key, url, params, previous) => {
+  if (inFlight.has(key)) {
+    return inFlight.get(key);
+  }
+
+  const headers = previous?.etag ? { 'If-None-Match': previous.etag } : {};
+  const request = api
+    .get(url, {
+      params,
+      headers,
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    })
+    .then((response) => {
+      const notModified = response.status === 304 && previous;
+      const entry = notModified
+        ? { ...previous, storedAt: Date.now() }
+        : {
+            key,
+            data: response.data,
+            etag: response.headers.etag || null,
+            generation: response.headers['x-data-generation'] || null,
+            storedAt: Date.now(),
+          };
+      remember(key, entry);
+      persist(entry);
+      return { response: toResponse(entry, false), changed: !notModified };
+    })
+    .finally(() => inFlight.delete(key));
+
+  inFlight.set(key, request);
+  return request;
+};
+
+// GET with caching. Cached data is returned immediately; if it is older than
+// FRESH_FOR_MS it is revalidated in the background and `onUpdate` receives the
+// new response when the data changed. `force` waits for the network.
+export const cachedGet = async (url, { params, force = false, onUpdate } = {}) => {
+  const key = cacheKey(url, params);
+
+  let entry = memoryCache.get(key);
+  if (!entry) {
+    entry = await readPersisted(key);
+  }
+  if (entry) {
+    remember(key, entry);
+  }
+
+  if (!entry || force) {
+    const { response } = await revalidate(key, url, params, entry);
+    return response;
+  }
+
+  if (Date.now() - entry.storedAt > FRESH_FOR_MS) {
+    revalidate(key, url, params, entry)
+      .then(({ response, changed }) => {
+        if (changed && onUpdate) {
+          onUpdate(response);
+        }
+      })
+      .catch((error) => console.error('Background revalidation failed:', error));
+  }
+
+  return toResponse(entry, true);
+};
+
+export const clearCache = async () => {
+  memoryCache.clear();
+  await withStore('readwrite', (store) => store.clear());
+};
+
 // API endpoints
 export const marketAPI = {
-  getOverview: () => api.get('/api/market/overview'),
-  getSize: () => api.get('/api/market/size'),
-  getForecasts: () => api.get('/api/forecasts'),
+  getOverview: (options) => cachedGet('/api/market/overview', options),
+  getSize: (options) => cachedGet('/api/market/size', options),
+  getForecasts: (options) => cachedGet('/api/forecasts', options),
 };
 
 export const pricingAPI = {
-  getPricing: () => api.get('/api/pricing'),
+  getPricing: (options) => cachedGet('/api/pricing', options),
 };
 
 export const competitorAPI = {
-  getCompetitors: () => api.get('/api/competitors'),
+  getCompetitors: (options) => cachedGet('/api/competitors', options),
 };
 
 export const regionalAPI = {
-  getRegional: () => api.get('/api/regional'),
+  getRegional: (options) => cachedGet('/api/regional', options),
 };
 
 export const serviceAPI = {
-  getServices: () => api.get('/api/services'),
+  getServices: (options) => cachedGet('/api/services', options),
+  getRollup: (params, options) => cachedGet('/api/services/rollup', { ...options, params }),
 };
 
 export const trendAPI = {
-  getTrends: () => api.get('/api/trends'),
+  getTrends: (options) => cachedGet('/api/trends', options),
+};
+
+export const scenarioAPI = {
+  getScenarios: (params, options) => cachedGet('/api/scenarios', { ...options, params }),
 };
 
 export const dashboardAPI = {
-  getSummary: () => api.get('/api/dashboard/summary'),
+  getSummary: (options) => cachedGet('/api/dashboard/summary', options),
 };
 
-export const refreshData = () => api.post('/api/refresh');
+export const refreshData = async () => {
+  const response = await api.post('/api/refresh');
+  await clearCache();
+  return response;
+};
 
 export default api;